@@ -6,7 +6,7 @@
 
 import logging
 import os
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Union
 
 import numpy as np
 from aria_gen2_pilot_dataset.data_provider.aria_gen2_pilot_data_file_keys import (
@@ -28,10 +28,7 @@ from projectaria_tools.core.mps import (
     EyeGaze,
     OpenLoopTrajectoryPose,
 )
-from projectaria_tools.core.mps.utils import (
-    filter_points_from_confidence,
-    filter_points_from_count,
-)
+from projectaria_tools.core.mps.utils import filter_points_from_confidence
 from projectaria_tools.core.sensor_data import (
     AlsData,
     AudioData,
@@ -724,13 +721,19 @@ class AriaGen2PilotDataProvider:
         return self.mps_data_provider_.get_semidense_point_cloud()
 
     def get_mps_semidense_point_cloud_filtered(
-        self, filter_confidence: bool = True, max_point_count: Optional[int] = None
+        self,
+        filter_confidence: bool = True,
+        max_point_count: Optional[int] = None,
+        rng: Optional[Union[int, np.random.Generator]] = None,
     ) -> List[mps.GlobalPointPosition]:
         """Get the MPS semidense point cloud with filtering applied.
 
         Args:
             filter_confidence: If True, filter out low confidence points
             max_point_count: Maximum number of points to return (for downsampling)
+            rng: Random generator, or seed, used for downsampling. If None, the seed is
+                drawn from the global NumPy random state, so np.random.seed() keeps the
+                downsampling reproducible
 
         Returns:
             Filtered list of GlobalPointPosition objects
@@ -750,7 +753,19 @@ class AriaGen2PilotDataProvider:
 
         # Apply count-based downsampling if requested
         if max_point_count is not None and len(points_data) > max_point_count:
-            points_data = filter_points_from_count(points_data, max_point_count)
+            self.logger.info(
+                "Reducing number of semidense points from %d to %d.",
+                len(points_data),
+                max_point_count,
+            )
+            # Generator.choice without replacement only shuffles max_point_count of the
+            # indices, and the points are gathered directly without stacking the list
+            if rng is None:
+                rng = np.random.randint(np.iinfo(np.int64).max, dtype=np.int64)
+            sampled_indices = np.random.default_rng(rng).choice(
+                len(points_data), max_point_count, replace=False
+            )
+            points_data = [points_data[i] for i in sampled_indices.tolist()]
 
         return points_data
 
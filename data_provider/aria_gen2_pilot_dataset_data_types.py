@@ -10,8 +10,8 @@ AriaGen2PilotDataset Data Types
 This module defines core data structures and types used in the Aria Gen2 Pilot Dataset.
 """
 
-from dataclasses import dataclass
-from typing import List
+from dataclasses import dataclass, field
+from typing import Callable, List, Tuple, Union
 
 import numpy as np
 
@@ -87,14 +87,27 @@ class HandObjectInteractionDataRaw:
 
     This format is used internally by the hand object interaction provider for fast loading and low memory usage.
     RLE segmentation is kept in compressed format until decoding is requested.
+    Instances use __slots__ (dataclass(slots=True) needs Python 3.10) to avoid a per-record __dict__.
     """
 
+    __slots__ = (
+        "timestamp_ns",
+        "original_image_id",
+        "category_id",
+        "bbox_index",
+        "segmentation_size",
+        "segmentation_runs",
+        "score",
+    )
+
     timestamp_ns: int  # PRIMARY KEY: timestamp in nanoseconds
     original_image_id: int  # Original COCO image_id for reference
     category_id: int  # 1=left_hand, 2=right_hand, 3=interacting_object
-    bbox: List[float]  # [x, y, width, height] in pixels
-    segmentation_size: List[int]  # [height, width] from RLE
-    segmentation_counts: str  # RLE compressed string
+    bbox_index: (
+        int  # Row of the [x, y, width, height] bbox in the provider (N, 4) bbox table
+    )
+    segmentation_size: Tuple[int, int]  # (height, width) from RLE, interned
+    segmentation_runs: np.ndarray  # int32 RLE counts, parsed from the compressed string
     score: float  # Confidence score [0.0, 1.0]
 
 
@@ -102,15 +115,70 @@ class HandObjectInteractionDataRaw:
 class HandObjectInteractionData:
     """
     User-facing format with decoded segmentation masks for convenient access.
+
+    masks can be given as a callable returning the list of masks, it is then only called on
+    first access of masks, so consumers of bboxes and scores alone never decode them.
+    Lazily decoded masks are cached unpacked (one uint8 per pixel) and read-only, copy a mask
+    before modifying it. packed_masks gives the masks bit-packed along the width (8x smaller)
+    instead, without keeping the decoded masks when they were not accessed yet.
+    masks are left out of repr() and ==, so neither decodes them.
     """
 
     timestamp_ns: int  # PRIMARY KEY: timestamp in nanoseconds
     category_id: int  # 1=left_hand, 2=right_hand, 3=interacting_object
-    masks: List[np.ndarray]  # List of decoded binary masks (height, width) uint8 arrays
-    bboxes: List[
-        List[float]
-    ]  # List of bounding boxes [x, y, width, height] for each mask
-    scores: List[float]  # List of confidence scores [0.0, 1.0] for each mask
+    masks: List[np.ndarray] = field(
+        repr=False, compare=False
+    )  # List of binary masks (height, width) uint8 arrays
+    bboxes: (
+        np.ndarray
+    )  # (N, 4) float32 bounding boxes [x, y, width, height], one per mask
+    scores: np.ndarray  # (N,) float32 confidence scores [0.0, 1.0], one per mask
+
+    def __init__(
+        self,
+        timestamp_ns: int,
+        category_id: int,
+        masks: Union[List[np.ndarray], Callable[[], List[np.ndarray]]],
+        bboxes: np.ndarray,
+        scores: np.ndarray,
+    ):
+        self.timestamp_ns = timestamp_ns
+        self.category_id = category_id
+        # Lazy masks are only set as an instance attribute once decoded, see __getattr__
+        if callable(masks):
+            self._masks_loader = masks
+        else:
+            self.masks = masks
+        self.bboxes = bboxes
+        self.scores = scores
+
+    def __getattr__(self, name: str):
+        # Only called for attributes missing from the instance, i.e. masks not decoded yet
+        masks_loader = self.__dict__.get("_masks_loader")
+        if name != "masks" or masks_loader is None:
+            raise AttributeError(
+                f"'{type(self).__name__}' object has no attribute '{name}'"
+            )
+        masks = masks_loader()
+        for mask in masks:
+            mask.setflags(write=False)
+        self.masks = masks
+        # The loader may reference the source data of the masks, release it
+        del self._masks_loader
+        return masks
+
+    @property
+    def packed_masks(self) -> List[np.ndarray]:
+        """List of binary masks packed with np.packbits along the width, (height, ceil(width / 8)) uint8 arrays."""
+        packed_masks = self.__dict__.get("_packed_masks")
+        if packed_masks is None:
+            # Pack masks not decoded yet straight from the loader, without caching them
+            masks = self.__dict__.get("masks")
+            if masks is None:
+                masks = self._masks_loader()
+            packed_masks = [np.packbits(mask, axis=-1) for mask in masks]
+            self._packed_masks = packed_masks
+        return packed_masks
 
 
 @dataclass
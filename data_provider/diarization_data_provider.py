@@ -4,12 +4,23 @@
 # This source code is licensed under the license found in the
 # LICENSE file in the root directory of this source tree.
 
-import bisect
 import csv
-from typing import List
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+try:
+    # pandas is an optional accelerator, fall back to the csv module when missing
+    import pandas as pd
+except ImportError:
+    pd = None
 
 from .aria_gen2_pilot_dataset_data_types import DiarizationData
-from .utils import check_valid_csv
+from .diarization_data_provider_numba import NUMBA_AVAILABLE
+from .utils import bisect_right_with_hint, check_valid_csv
+
+if NUMBA_AVAILABLE:
+    from . import diarization_data_provider_numba
 
 
 class DiarizationDataProvider:
@@ -17,40 +28,97 @@ class DiarizationDataProvider:
 
     def __init__(self, data_path: str):
         self.data_path = data_path
-        self.diarization_data: List[DiarizationData] = []
         self.start_timestamp_ns_list: List[int] = []
+        # Structure-of-arrays storage sorted by start timestamp, DiarizationData objects
+        # are created on query
+        self._start_timestamps_ns: np.ndarray = np.empty(0, dtype=np.int64)
+        self._end_timestamps_ns: np.ndarray = np.empty(0, dtype=np.int64)
+        # Running maximum of end timestamps, non-decreasing so it can be binary searched
+        self._max_end_timestamps_ns: np.ndarray = np.empty(0, dtype=np.int64)
+        self._speakers: List[str] = []
+        self._contents: List[str] = []
+        # Materialized on first access of diarization_data
+        self._diarization_data: Optional[List[DiarizationData]] = None
+        # Number of utterances starting before the previous query end, sequential queries start from it.
+        # Shared by all callers without locking, see _get_candidate_range()
+        self._last_query_upper_bound = 0
         self._load_data()
 
+    @property
+    def diarization_data(self) -> List[DiarizationData]:
+        """All utterances sorted by start timestamp, built on first access."""
+        if self._diarization_data is None:
+            self._diarization_data = [
+                self._make_diarization_data(i)
+                for i in range(len(self.start_timestamp_ns_list))
+            ]
+        return self._diarization_data
+
     def _load_data(self) -> None:
         check_valid_csv(
             self.data_path, "start_timestamp_ns,end_timestamp_ns,speaker,content"
         )
         try:
-            with open(self.data_path, "r") as csvfile:
-                reader = csv.DictReader(csvfile)
-                for row in reader:
-                    self.diarization_data.append(
-                        DiarizationData(
-                            int(row["start_timestamp_ns"]),
-                            int(row["end_timestamp_ns"]),
-                            str(row["speaker"]),
-                            str(row["content"]),
+            if pd is not None:
+                # Typed columns are parsed in C, keep_default_na keeps e.g. empty content as ""
+                df = pd.read_csv(
+                    self.data_path,
+                    dtype={
+                        "start_timestamp_ns": np.int64,
+                        "end_timestamp_ns": np.int64,
+                        "speaker": str,
+                        "content": str,
+                    },
+                    keep_default_na=False,
+                    engine="c",
+                )
+                # pandas moves the leading fields of rows longer than the header to the index
+                if not isinstance(df.index, pd.RangeIndex):
+                    raise ValueError("Rows have more fields than the header")
+                start_timestamps_ns = df["start_timestamp_ns"].to_numpy(dtype=np.int64)
+                end_timestamps_ns = df["end_timestamp_ns"].to_numpy(dtype=np.int64)
+                # Missing trailing fields of short rows are read as NaN by older pandas
+                speakers = df["speaker"].fillna("").tolist()
+                contents = df["content"].fillna("").tolist()
+            else:
+                start_timestamp_ns_list = []
+                end_timestamp_ns_list = []
+                speakers = []
+                contents = []
+                with open(self.data_path, "r") as csvfile:
+                    reader = csv.DictReader(csvfile)
+                    for row in reader:
+                        # Same rules as the pandas path: extra fields are rejected, missing
+                        # timestamps fail to parse and missing text fields are empty
+                        if None in row:
+                            raise ValueError(
+                                f"Line {reader.line_num} has more fields than the header"
+                            )
+                        start_timestamp_ns_list.append(
+                            int(row["start_timestamp_ns"] or "")
                         )
-                    )
-
-            # Only sort if not already sorted
-            if any(
-                self.diarization_data[i].start_timestamp_ns
-                > self.diarization_data[i + 1].start_timestamp_ns
-                for i in range(len(self.diarization_data) - 1)
-            ):
-                self.diarization_data.sort(key=lambda x: x.start_timestamp_ns)
-
-            self.start_timestamp_ns_list = [
-                data.start_timestamp_ns for data in self.diarization_data
-            ]
-
-        except (FileNotFoundError, KeyError, ValueError) as e:
+                        end_timestamp_ns_list.append(int(row["end_timestamp_ns"] or ""))
+                        speakers.append(row["speaker"] or "")
+                        contents.append(row["content"] or "")
+                start_timestamps_ns = np.array(start_timestamp_ns_list, dtype=np.int64)
+                end_timestamps_ns = np.array(end_timestamp_ns_list, dtype=np.int64)
+
+            # Only sort if not already sorted, the stable sort keeps the file order of equal starts
+            if (np.diff(start_timestamps_ns) < 0).any():
+                order = np.argsort(start_timestamps_ns, kind="stable")
+                start_timestamps_ns = start_timestamps_ns[order]
+                end_timestamps_ns = end_timestamps_ns[order]
+                speakers = [speakers[i] for i in order.tolist()]
+                contents = [contents[i] for i in order.tolist()]
+
+            self._start_timestamps_ns = np.ascontiguousarray(start_timestamps_ns)
+            self._end_timestamps_ns = np.ascontiguousarray(end_timestamps_ns)
+            self._max_end_timestamps_ns = np.maximum.accumulate(self._end_timestamps_ns)
+            self._speakers = speakers
+            self._contents = contents
+            self.start_timestamp_ns_list = self._start_timestamps_ns.tolist()
+
+        except (FileNotFoundError, KeyError, ValueError, OverflowError) as e:
             raise RuntimeError(
                 f"Failed to load diarization data from {self.data_path}: {e}"
             )
@@ -59,11 +127,20 @@ class DiarizationDataProvider:
                 "No diarization data found, can not initialize DiarizationDataProvider."
             )
 
+    def _make_diarization_data(self, index: int) -> DiarizationData:
+        """Create the DiarizationData of the utterance at index, with Python int timestamps."""
+        return DiarizationData(
+            self.start_timestamp_ns_list[index],
+            int(self._end_timestamps_ns[index]),
+            self._speakers[index],
+            self._contents[index],
+        )
+
     def get_diarization_data_by_index(self, index: int) -> DiarizationData:
         """Get utterance by index."""
-        if index < 0 or index >= len(self.diarization_data):
+        if index < 0 or index >= len(self.start_timestamp_ns_list):
             raise IndexError(f"Index {index} out of range.")
-        return self.diarization_data[index]
+        return self._make_diarization_data(index)
 
     def get_diarization_data_by_timestamp_ns(
         self, timestamp_ns: int
@@ -71,21 +148,12 @@ class DiarizationDataProvider:
         """Get utterances spanning timestamp.
         Specifically, this function will find all utterances that satisfy: data.start_timestamp <= query_timestamp and data.end_timestamp >= query_timestamp.
 
+        Queries with increasing timestamps are fastest, see _get_candidate_range().
+
         Returns:
             List of DiarizationData sorted by start timestamp.
         """
-        if not self.diarization_data:
-            return []
-
-        # Find segments with start <= timestamp
-        right = bisect.bisect_right(self.start_timestamp_ns_list, timestamp_ns)
-
-        result = []
-        for i in range(right):
-            data = self.diarization_data[i]
-            if timestamp_ns <= data.end_timestamp_ns:
-                result.append(data)
-        return result
+        return self._get_overlapping_diarization_data(timestamp_ns, timestamp_ns)
 
     def get_diarization_data_by_start_and_end_timestamps(
         self, start_timestamp_ns: int, end_timestamp_ns: int
@@ -94,23 +162,63 @@ class DiarizationDataProvider:
         This function returns all utterances that satisfies ANY of the following conditions:
         1. `data.start_timestamp <= query_start_timestamp`.
         2. `data.end_timestamp >= query_end_timestamp`.
+        Queries with increasing intervals are fastest, see _get_candidate_range().
 
         Returns:
             List of DiarizationData sorted by start timestamp.
         """
-        if not self.diarization_data:
-            return []
+        return self._get_overlapping_diarization_data(
+            start_timestamp_ns, end_timestamp_ns
+        )
 
-        # Binary search: find first segment that could overlap (segment_start <= query_end)
-        start_idx = bisect.bisect_right(self.start_timestamp_ns_list, end_timestamp_ns)
+    def has_overlap(self, start_timestamp_ns: int, end_timestamp_ns: int) -> bool:
+        """Check whether any utterance overlaps with the specified time interval, with the same
+        condition as get_diarization_data_by_start_and_end_timestamps() but without creating
+        DiarizationData objects.
+        """
+        left, right = self._get_candidate_range(start_timestamp_ns, end_timestamp_ns)
+        # The running maximum end at left comes from a segment at or before left, that
+        # segment overlaps
+        return left < right
+
+    def _get_candidate_range(
+        self, start_timestamp_ns: int, end_timestamp_ns: int
+    ) -> Tuple[int, int]:
+        """Get the [left, right) index range holding all utterances overlapping the interval.
+
+        The search for right starts from the previous query, a best-effort and not
+        thread-safe hint: bisect_right_with_hint() checks it before use, so a hint left by
+        another thread or an unordered query only costs a binary search.
+        """
+        # Binary search: only segments with start <= query_end can overlap
+        right = bisect_right_with_hint(
+            self.start_timestamp_ns_list, end_timestamp_ns, self._last_query_upper_bound
+        )
+        self._last_query_upper_bound = right
+        # Binary search: no segment before the running maximum end reaches query_start
+        # can overlap
+        left = int(
+            np.searchsorted(
+                self._max_end_timestamps_ns[:right], start_timestamp_ns, side="left"
+            )
+        )
+        return left, right
 
-        result = []
-        for i in range(start_idx):
-            data = self.diarization_data[i]
-            # Check full overlap
-            if start_timestamp_ns <= data.end_timestamp_ns:
-                result.append(data)
-        return result
+    def _get_overlapping_diarization_data(
+        self, start_timestamp_ns: int, end_timestamp_ns: int
+    ) -> List[DiarizationData]:
+        """Get utterances with data.start_timestamp <= end_timestamp_ns and data.end_timestamp >= start_timestamp_ns."""
+        left, right = self._get_candidate_range(start_timestamp_ns, end_timestamp_ns)
+        # Vectorized end check over the candidates, indices come out in start order
+        if NUMBA_AVAILABLE:
+            indices = diarization_data_provider_numba.overlap_indices(
+                self._end_timestamps_ns, left, right, start_timestamp_ns
+            )
+        else:
+            indices = left + np.flatnonzero(
+                self._end_timestamps_ns[left:right] >= start_timestamp_ns
+            )
+        return [self._make_diarization_data(i) for i in indices.tolist()]
 
     def get_diarization_data_total_number(self) -> int:
-        return len(self.diarization_data)
+        return len(self.start_timestamp_ns_list)
@@ -0,0 +1,42 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+# All rights reserved.
+#
+# This source code is licensed under the license found in the
+# LICENSE file in the root directory of this source tree.
+
+"""
+Numba compiled kernels for diarization interval queries.
+
+Numba is an optional dependency: when it is not installed, NUMBA_AVAILABLE is False and
+DiarizationDataProvider keeps using its NumPy implementation.
+"""
+
+import numpy as np
+
+try:
+    from numba import njit
+
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+if NUMBA_AVAILABLE:
+
+    @njit(cache=True, nogil=True, boundscheck=False)
+    def overlap_indices(
+        end_timestamps_ns: np.ndarray, left: int, right: int, start_timestamp_ns: int
+    ) -> np.ndarray:
+        """
+        Get indices left <= i < right with end_timestamps_ns[i] >= start_timestamp_ns (int64 array).
+        Compiled equivalent of left + np.flatnonzero(end_timestamps_ns[left:right] >= start_timestamp_ns),
+        without the temporary boolean array.
+        """
+        indices = np.empty(right - left, dtype=np.int64)
+        num_indices = 0
+        # Branchless compress: always store, only advance past overlapping segments.
+        # num_indices <= i - left, so the store stays in bounds
+        for i in range(left, right):
+            indices[num_indices] = i
+            num_indices += end_timestamps_ns[i] >= start_timestamp_ns
+        return indices[:num_indices]
@@ -4,9 +4,14 @@
 # This source code is licensed under the license found in the
 # LICENSE file in the root directory of this source tree.
 
+import itertools
 import json
+import mmap
 import os
-from typing import Dict, List, Optional
+from collections.abc import Sequence
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
 
 import numpy as np
 from PIL import Image
@@ -14,6 +19,18 @@ from PIL import Image
 from projectaria_tools.core.sensor_data import TimeQueryOptions
 from tqdm import tqdm
 
+try:
+    # orjson is an optional accelerator, fall back to stdlib json when missing
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    # ijson is optional, it allows streaming very large annotation files
+    import ijson
+except ImportError:
+    ijson = None
+
 # Use self-contained RLE utilities instead of external pycocotools
 from . import rle_utils
 
@@ -21,7 +38,48 @@ from .aria_gen2_pilot_dataset_data_types import (
     HandObjectInteractionData,
     HandObjectInteractionDataRaw,
 )
-from .utils import find_timestamp_index_by_time_query_option
+from .utils import (
+    bisect_right_with_hint,
+    find_timestamp_index_by_upper_bound,
+    find_timestamp_indices_by_time_query_option,
+)
+
+# Number of decoded timestamps kept in memory. Each entry holds full resolution
+# masks (several MB per mask), so the cache is kept small.
+HOI_DECODED_DATA_CACHE_SIZE = 32
+
+# Annotation files with fewer entries are parsed on the calling thread, since the
+# thread pool start-up would outweigh the gain.
+HOI_PARALLEL_PARSE_MIN_ANNOTATIONS = 4096
+
+# Annotation files at least this large are streamed with ijson (when installed)
+# instead of being decoded into one JSON document in memory.
+HOI_STREAMING_LOAD_MIN_FILE_SIZE = 1 << 30
+# Number of streamed annotations gathered before converting them to raw records
+HOI_STREAMING_BATCH_SIZE = 10000
+# Annotation files at least this large are memory-mapped for orjson instead of read
+# into a bytes copy.
+HOI_MMAP_LOAD_MIN_FILE_SIZE = 200 << 20
+
+
+class _DecodedHoiDataList(Sequence):
+    """Read-only list of the interactions at each timestamp, decoded (not resized) on access."""
+
+    def __init__(self, provider: "HandObjectInteractionDataProvider"):
+        self._provider = provider
+
+    def __len__(self) -> int:
+        return self._provider.get_hoi_total_number()
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        num_timestamps = len(self)
+        if index < 0:
+            index += num_timestamps
+        if not 0 <= index < num_timestamps:
+            raise IndexError("hoi_data_list index out of range")
+        return self._provider.get_hoi_data_by_index(index, resize_masks=False)
 
 
 class HandObjectInteractionDataProvider:
@@ -39,12 +97,25 @@ class HandObjectInteractionDataProvider:
         rgb image size is needed to resize the segmentation mask to the same size as rgb image
         """
         # Store data and timestamps in separate lists following the standard pattern
-        # Now storing decoded data directly instead of raw RLE data
-        self.hoi_data_list: List[List[HandObjectInteractionData]] = []
-        self.timestamps_ns: List[int] = []
+        # RLE masks are kept compressed and only decoded when queried
+        self.hoi_raw_data_list: List[List[HandObjectInteractionDataRaw]] = []
+        self._timestamps_ns: np.ndarray = np.empty(0, dtype=np.int64)
+        # Index of each timestamp, queries at an annotated timestamp skip the search
+        self._timestamp_to_index: Dict[int, int] = {}
+        # Number of timestamps <= the previous query, sequential queries start from it.
+        # Shared by all callers without locking: a hint written by another thread is
+        # still checked before use, so it can only cost the fast path, never the result.
+        self._last_query_upper_bound = 0
+        # [x, y, width, height] of all detections, rows referenced by raw data bbox_index
+        self._bboxes: np.ndarray = np.empty((0, 4), dtype=np.float32)
         self.rgb_width = rgb_width
         self.rgb_height = rgb_height
 
+        # Per-instance LRU cache, so repeated queries of the same timestamp skip decoding
+        self._get_decoded_hoi_data = lru_cache(maxsize=HOI_DECODED_DATA_CACHE_SIZE)(
+            self._decode_hoi_data
+        )
+
         self._load_data(data_path)
 
     def _load_data(self, data_path: str) -> None:
@@ -53,66 +124,200 @@ class HandObjectInteractionDataProvider:
             raise FileNotFoundError(f"File not found: {data_path}")
 
         try:
-            with open(data_path, "r") as f:
+            # Process annotations with progress bar
+            print("Loading hand-object interaction annotations...")
+            if (
+                ijson is not None
+                and os.path.getsize(data_path) >= HOI_STREAMING_LOAD_MIN_FILE_SIZE
+            ):
+                raw_data_list, self._bboxes = self._stream_annotations(data_path)
+            else:
+                raw_data_list, self._bboxes = self._read_annotations(data_path)
+
+            # Group annotations by timestamp: a stable sort keeps the original
+            # annotation order within each timestamp, and the group boundaries are
+            # where the sorted timestamps change value. COCO results are usually
+            # already ordered by image_id, in which case the sort is skipped.
+            if raw_data_list:
+                timestamps_ns = np.fromiter(
+                    (raw_data.timestamp_ns for raw_data in raw_data_list),
+                    dtype=np.int64,
+                    count=len(raw_data_list),
+                )
+                timestamp_diffs = np.diff(timestamps_ns)
+                if (timestamp_diffs < 0).any():
+                    order = np.argsort(timestamps_ns, kind="stable")
+                    raw_data_list = [raw_data_list[i] for i in order]
+                    timestamps_ns = timestamps_ns[order]
+                    timestamp_diffs = np.diff(timestamps_ns)
+                group_starts = np.concatenate(
+                    ([0], np.flatnonzero(timestamp_diffs) + 1)
+                )
+                group_ends = np.append(group_starts[1:], len(raw_data_list))
+                self._timestamps_ns = timestamps_ns[group_starts]
+                self._timestamps_ns.setflags(write=False)
+                self._timestamp_to_index = {
+                    timestamp_ns: index
+                    for index, timestamp_ns in enumerate(self._timestamps_ns.tolist())
+                }
+                self.hoi_raw_data_list = [
+                    raw_data_list[start:end]
+                    for start, end in zip(group_starts.tolist(), group_ends.tolist())
+                ]
+
+        except Exception as e:
+            raise RuntimeError(
+                f"Failed to load hand-object interaction data from {data_path}: {e}"
+            )
+        if self._timestamps_ns.size == 0:
+            raise RuntimeError(
+                f"No hand-object interaction data found in {data_path}, can not initialize HandObjectInteractionDataProvider."
+            )
+
+    def _read_annotations(
+        self, data_path: str
+    ) -> Tuple[List[HandObjectInteractionDataRaw], np.ndarray]:
+        """Decode the whole annotation file in memory and convert it to raw records and a bbox table."""
+        # Binary mode lets the JSON parser validate UTF-8 itself, without text decoding in Python
+        with open(data_path, "rb") as f:
+            if orjson is None:
                 annotations = json.load(f)
+            elif os.fstat(f.fileno()).st_size >= HOI_MMAP_LOAD_MIN_FILE_SIZE:
+                with mmap.mmap(
+                    f.fileno(), 0, access=mmap.ACCESS_READ
+                ) as mapped_file, memoryview(mapped_file) as buffer:
+                    annotations = orjson.loads(buffer)
+            else:
+                annotations = orjson.loads(f.read())
+
+        if not isinstance(annotations, list):
+            raise ValueError("hand-object interaction results not an array of objects")
+        raw_data_list: List[HandObjectInteractionDataRaw] = []
+        bbox_chunks: List[np.ndarray] = []
+
+        num_workers = os.cpu_count() or 1
+        with tqdm(total=len(annotations), desc="Processing annotations") as pbar:
+            if (
+                num_workers == 1
+                or len(annotations) < HOI_PARALLEL_PARSE_MIN_ANNOTATIONS
+            ):
+                raw_data_list, bboxes = self._parse_annotations(annotations, 0)
+                bbox_chunks.append(bboxes)
+                pbar.update(len(annotations))
+            else:
+                # RLE counts parsing runs in numba (GIL released) or numpy, so
+                # annotation chunks can be parsed concurrently in threads.
+                chunk_size = -(-len(annotations) // num_workers)
+                chunk_starts = range(0, len(annotations), chunk_size)
+                chunks = [annotations[i : i + chunk_size] for i in chunk_starts]
+                with ThreadPoolExecutor(max_workers=num_workers) as executor:
+                    # map() yields in submission order, so annotation order is kept
+                    for chunk_raw_data_list, chunk_bboxes in executor.map(
+                        self._parse_annotations, chunks, chunk_starts
+                    ):
+                        raw_data_list.extend(chunk_raw_data_list)
+                        bbox_chunks.append(chunk_bboxes)
+                        pbar.update(len(chunk_raw_data_list))
+
+        return raw_data_list, np.concatenate(bbox_chunks)
 
-            if not isinstance(annotations, list):
+    def _stream_annotations(
+        self, data_path: str
+    ) -> Tuple[List[HandObjectInteractionDataRaw], np.ndarray]:
+        """Stream annotations from a large file with ijson and convert them to raw records and a bbox table in batches."""
+        raw_data_list: List[HandObjectInteractionDataRaw] = []
+        bbox_chunks: List[np.ndarray] = []
+        annotations: List[dict] = []
+        with open(data_path, "rb") as f, tqdm(desc="Processing annotations") as pbar:
+            # use_float keeps bbox and score as float instead of Decimal
+            events = ijson.parse(f, use_float=True)
+            # items() of any other top level yields nothing, reject it like _read_annotations
+            first_event = next(events)
+            if first_event[1] != "start_array":
                 raise ValueError(
                     "hand-object interaction results not an array of objects"
                 )
-            temp_data: Dict[int, List[HandObjectInteractionDataRaw]] = {}
+            for annotation in ijson.items(
+                itertools.chain((first_event,), events), "item"
+            ):
+                annotations.append(annotation)
+                if len(annotations) == HOI_STREAMING_BATCH_SIZE:
+                    batch_raw_data_list, batch_bboxes = self._parse_annotations(
+                        annotations, len(raw_data_list)
+                    )
+                    raw_data_list.extend(batch_raw_data_list)
+                    bbox_chunks.append(batch_bboxes)
+                    pbar.update(len(annotations))
+                    annotations = []
+            batch_raw_data_list, batch_bboxes = self._parse_annotations(
+                annotations, len(raw_data_list)
+            )
+            raw_data_list.extend(batch_raw_data_list)
+            bbox_chunks.append(batch_bboxes)
+            pbar.update(len(annotations))
+        return raw_data_list, np.concatenate(bbox_chunks)
 
-            # Process annotations with progress bar
-            print("Loading hand-object interaction annotations...")
-            for annotation in tqdm(annotations, desc="Processing annotations"):
-                original_image_id = int(annotation["image_id"])
-                timestamp_ns = int(original_image_id * 1e6)
-
-                segmentation = annotation["segmentation"]
-                if (
-                    not isinstance(segmentation, dict)
-                    or "size" not in segmentation
-                    or "counts" not in segmentation
-                ):
-                    raise ValueError("Invalid segmentation format in annotation")
-
-                hoi_data = HandObjectInteractionDataRaw(
+    @staticmethod
+    def _parse_annotations(
+        annotations: List[dict], first_bbox_index: int
+    ) -> Tuple[List[HandObjectInteractionDataRaw], np.ndarray]:
+        """Convert COCO-format annotations to HandObjectInteractionDataRaw, in order.
+
+        Returns:
+            Tuple of (raw data list, (N, 4) float32 bboxes), the bbox of raw data i being
+            row i, which is referenced with bbox_index first_bbox_index + i.
+        """
+        raw_data_list: List[HandObjectInteractionDataRaw] = []
+        bbox_list: List[List[float]] = []
+        # All masks of a recording share a few sizes, keep one tuple per distinct size
+        segmentation_sizes: Dict[Tuple[int, int], Tuple[int, int]] = {}
+        for annotation in annotations:
+            original_image_id = int(annotation["image_id"])
+            timestamp_ns = original_image_id * 1_000_000
+
+            segmentation = annotation["segmentation"]
+            if (
+                not isinstance(segmentation, dict)
+                or "size" not in segmentation
+                or "counts" not in segmentation
+            ):
+                raise ValueError("Invalid segmentation format in annotation")
+
+            height, width = segmentation["size"]
+            segmentation_size = (int(height), int(width))
+            segmentation_size = segmentation_sizes.setdefault(
+                segmentation_size, segmentation_size
+            )
+
+            raw_data_list.append(
+                HandObjectInteractionDataRaw(
                     timestamp_ns=timestamp_ns,
                     original_image_id=original_image_id,
                     category_id=int(annotation["category_id"]),
-                    bbox=annotation["bbox"],
-                    segmentation_size=segmentation["size"],
-                    segmentation_counts=segmentation["counts"],
+                    bbox_index=first_bbox_index + len(bbox_list),
+                    segmentation_size=segmentation_size,
+                    segmentation_runs=rle_utils.rle_counts_from_coco_rle(segmentation),
                     score=float(annotation["score"]),
                 )
+            )
+            bbox_list.append(annotation["bbox"])
 
-                temp_data.setdefault(timestamp_ns, []).append(hoi_data)
-
-            # Convert raw data to decoded format during loading
-            sorted_temp_data = sorted(temp_data.items())
-            self.hoi_data_list = []
-            self.timestamps_ns = []
+        bboxes = np.asarray(bbox_list, dtype=np.float32)
+        if bboxes.size == 0:
+            bboxes = np.empty((0, 4), dtype=np.float32)
+        elif bboxes.ndim != 2 or bboxes.shape[1] != 4:
+            raise ValueError("Invalid bbox format in annotation")
+        return raw_data_list, bboxes
 
-            # Decode RLE data with progress bar
-            print("Decoding RLE masks...")
-            for timestamp_ns, raw_interactions in tqdm(
-                sorted_temp_data, desc="Decoding masks"
-            ):
-                # Decode RLE data immediately during loading
-                decoded_interactions = rle_utils.convert_to_decoded_format(
-                    raw_interactions
-                )
-                self.hoi_data_list.append(decoded_interactions)
-                self.timestamps_ns.append(timestamp_ns)
+    @property
+    def timestamps_ns(self) -> np.ndarray:
+        """Sorted read-only int64 array of the annotated timestamps."""
+        return self._timestamps_ns
 
-        except Exception as e:
-            raise RuntimeError(
-                f"Failed to load hand-object interaction data from {data_path}: {e}"
-            )
-        if len(self.timestamps_ns) == 0:
-            raise RuntimeError(
-                f"No hand-object interaction data found in {data_path}, can not initialize HandObjectInteractionDataProvider."
-            )
+    @property
+    def hoi_data_list(self) -> Sequence:
+        """Interactions at each of timestamps_ns, decoded on access without resizing masks."""
+        return _DecodedHoiDataList(self)
 
     def get_hoi_data_by_timestamp_ns(
         self,
@@ -120,35 +325,81 @@ class HandObjectInteractionDataProvider:
         time_query_options: TimeQueryOptions = TimeQueryOptions.CLOSEST,
         resize_masks: bool = True,
     ) -> Optional[List[HandObjectInteractionData]]:
-        """Get all interactions at timestamp (hands + objects)."""
-        index = find_timestamp_index_by_time_query_option(
-            self.timestamps_ns, timestamp_ns, time_query_options
+        """Get all interactions at timestamp (hands + objects).
+
+        Queries with increasing timestamps start from the previous match. This hint is a
+        best-effort optimisation and not thread-safe: interleaved queries from several
+        threads or iterators get correct results but fall back to a binary search.
+        """
+        # An exact match is the result of every time query option
+        index = self._timestamp_to_index.get(timestamp_ns)
+        if index is not None:
+            self._last_query_upper_bound = index + 1
+            return self.get_hoi_data_by_index(index, resize_masks)
+
+        upper_bound = bisect_right_with_hint(
+            self._timestamps_ns, timestamp_ns, self._last_query_upper_bound
+        )
+        self._last_query_upper_bound = upper_bound
+        index = find_timestamp_index_by_upper_bound(
+            self._timestamps_ns, timestamp_ns, upper_bound, time_query_options
+        )
+        return self.get_hoi_data_by_index(int(index), resize_masks)
+
+    def get_hoi_data_by_timestamps_ns(
+        self,
+        timestamps_ns: np.ndarray,
+        time_query_options: TimeQueryOptions = TimeQueryOptions.CLOSEST,
+        resize_masks: bool = True,
+    ) -> List[Optional[List[HandObjectInteractionData]]]:
+        """Get all interactions at each of the specified timestamps, with a single vectorized search.
+
+        Returns:
+            List with one entry per queried timestamp, None where no valid match is found.
+        """
+        indices = find_timestamp_indices_by_time_query_option(
+            self._timestamps_ns, timestamps_ns, time_query_options
         )
-        return self.get_hoi_data_by_index(index, resize_masks)
+        return [
+            self.get_hoi_data_by_index(index, resize_masks)
+            for index in indices.ravel().tolist()
+        ]
 
     def get_hoi_data_by_index(
         self, index: int, resize_masks: bool = True
     ) -> Optional[List[HandObjectInteractionData]]:
-        """Get interactions by index."""
-        if 0 <= index < len(self.hoi_data_list):
-            # Data is already decoded, just retrieve it
-            decoded_data_list = self.hoi_data_list[index]
-
-            if resize_masks:
-                # Resize masks directly in-place by modifying the existing data
-                for hoi_data in decoded_data_list:
-                    # Resize each mask directly
-                    for i, mask in enumerate(hoi_data.masks):
-                        # Convert numpy array to PIL Image and resize
-                        mask_image = Image.fromarray(mask.astype(np.uint8))
-                        resized_mask = mask_image.resize(
-                            (self.rgb_width, self.rgb_height), resample=Image.NEAREST
-                        )
-                        hoi_data.masks[i] = np.array(resized_mask)
-
-            return decoded_data_list
+        """Get interactions by index.
+
+        Decoded results are cached and shared between calls, callers should not modify them in-place.
+        """
+        if 0 <= index < len(self.hoi_raw_data_list):
+            return self._get_decoded_hoi_data(index, resize_masks)
         return None
 
     def get_hoi_total_number(self) -> int:
         """Get total number of interaction timestamps."""
-        return len(self.hoi_data_list)
+        return len(self.hoi_raw_data_list)
+
+    def _decode_hoi_data(
+        self, index: int, resize_masks: bool
+    ) -> List[HandObjectInteractionData]:
+        """Group the interactions at index by category, masks are decoded (and resized) on first access."""
+        # Resized results only keep the resized masks, the full resolution ones are dropped
+        return rle_utils.convert_to_decoded_format(
+            self.hoi_raw_data_list[index],
+            self._bboxes,
+            lazy_masks=True,
+            masks_transform=self._resize_masks if resize_masks else None,
+        )
+
+    def _resize_masks(self, masks: List[np.ndarray]) -> List[np.ndarray]:
+        """Resize masks to the rgb image size."""
+        # Convert numpy array to PIL Image and resize
+        return [
+            np.array(
+                Image.fromarray(mask.astype(np.uint8)).resize(
+                    (self.rgb_width, self.rgb_height), resample=Image.NEAREST
+                )
+            )
+            for mask in masks
+        ]
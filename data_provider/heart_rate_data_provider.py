@@ -6,12 +6,24 @@
 
 import csv
 import logging
-from typing import List, Optional
+import warnings
+from typing import List, Optional, Tuple
 
+import numpy as np
 from projectaria_tools.core.sensor_data import TimeQueryOptions
 
+try:
+    # pyarrow is an optional accelerator, fall back to numpy.loadtxt when missing
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+except ImportError:
+    pa = None
+
 from .aria_gen2_pilot_dataset_data_types import HeartRateData
-from .utils import check_valid_csv, find_timestamp_index_by_time_query_option
+from .utils import check_valid_csv, find_timestamp_indices_by_time_query_option
+
+# Stride of the coarse timestamp index used to narrow range queries
+HEART_RATE_COARSE_INDEX_STRIDE = 8192
 
 
 class HeartRateDataProvider:
@@ -20,8 +32,13 @@ class HeartRateDataProvider:
     def __init__(self, data_path: str):
         """Initialize with path to heart_rate_results.csv."""
         self.data_path = data_path
-        self.heart_rate_data_list: List[HeartRateData] = []
-        self.timestamps_ns: List[int] = []
+        # Structure-of-arrays storage, HeartRateData objects are created on query
+        self._timestamps_ns: np.ndarray = np.empty(0, dtype=np.int64)
+        self._heart_rate_bpm: np.ndarray = np.empty(0, dtype=np.int64)
+        # Every HEART_RATE_COARSE_INDEX_STRIDE-th timestamp, small enough to stay in cache
+        self._coarse_timestamps_ns: np.ndarray = np.empty(0, dtype=np.int64)
+        # HeartRateData of every entry, only built for callers of heart_rate_data_list
+        self._heart_rate_data_list: Optional[List[HeartRateData]] = None
 
         # Set up logger
         self.logger = logging.getLogger(self.__class__.__name__)
@@ -33,59 +50,132 @@ class HeartRateDataProvider:
         check_valid_csv(self.data_path, "timestamp_ns,heart_rate_bpm")
 
         try:
-            with open(self.data_path, "r") as csvfile:
-                reader = csv.DictReader(csvfile)
-                for row in reader:
-                    timestamp_ns = int(row["timestamp_ns"])
-                    heart_rate_bpm = int(row["heart_rate_bpm"])
-
-                    heart_rate_data = HeartRateData(timestamp_ns, heart_rate_bpm)
-                    self.heart_rate_data_list.append(heart_rate_data)
-                    self.timestamps_ns.append(timestamp_ns)
-
-            # Ensure data is sorted by timestamp for efficient querying
-            if self.timestamps_ns and not all(
-                self.timestamps_ns[i] < self.timestamps_ns[i + 1]
-                for i in range(len(self.timestamps_ns) - 1)
-            ):
-                # Sort all data by timestamp
-                sorted_data = sorted(
-                    zip(self.timestamps_ns, self.heart_rate_data_list),
-                    key=lambda x: x[0],
+            timestamps_ns, heart_rate_bpm = self._read_csv_columns()
+
+            # Sort all data by timestamp for efficient querying, files are usually already sorted
+            timestamp_diffs = np.diff(timestamps_ns)
+            if (timestamp_diffs < 0).any():
+                order = np.argsort(timestamps_ns, kind="stable")
+                timestamps_ns = timestamps_ns[order]
+                heart_rate_bpm = heart_rate_bpm[order]
+                timestamp_diffs = np.diff(timestamps_ns)
+            self._timestamps_ns = np.ascontiguousarray(timestamps_ns)
+            self._heart_rate_bpm = np.ascontiguousarray(heart_rate_bpm)
+            # Storage is shared with callers through views, protect it from in-place changes
+            self._timestamps_ns.setflags(write=False)
+            self._heart_rate_bpm.setflags(write=False)
+
+            # Check for duplicate timestamps, adjacent after sorting
+            duplicate_mask = timestamp_diffs == 0
+            if duplicate_mask.any():
+                raise ValueError(
+                    f"Duplicate timestamp(s) found in heart rate data: {np.unique(self._timestamps_ns[1:][duplicate_mask]).tolist()}"
                 )
-                self.timestamps_ns, self.heart_rate_data_list = zip(*sorted_data)
-                self.timestamps_ns = list(self.timestamps_ns)
-                self.heart_rate_data_list = list(self.heart_rate_data_list)
-
-                # Check for duplicate timestamps
-                duplicates = [
-                    self.timestamps_ns[i]
-                    for i in range(len(self.timestamps_ns) - 1)
-                    if self.timestamps_ns[i] == self.timestamps_ns[i + 1]
-                ]
-                if duplicates:
-                    raise ValueError(
-                        f"Duplicate timestamp(s) found in heart rate data: {duplicates}"
-                    )
+            self._coarse_timestamps_ns = self._timestamps_ns[
+                ::HEART_RATE_COARSE_INDEX_STRIDE
+            ].copy()
 
         except Exception as e:
             raise RuntimeError(
                 f"Failed to load heart rate data from {self.data_path}: {e}"
             )
-        if not self.heart_rate_data_list:
+        if self._timestamps_ns.size == 0:
             raise RuntimeError(
                 "No heart rate data found, can not initialize HeartRateDataProvider."
             )
 
+    def _read_csv_columns(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Read the timestamp_ns and heart_rate_bpm columns as int64 arrays, in file order.
+
+        Values must fit in int64, other rows accepted by csv.DictReader (e.g. quoted or
+        extra fields) are parsed like the csv module does.
+        """
+        if pa is not None:
+            try:
+                table = pa_csv.read_csv(
+                    self.data_path,
+                    convert_options=pa_csv.ConvertOptions(
+                        column_types={
+                            "timestamp_ns": pa.int64(),
+                            "heart_rate_bpm": pa.int64(),
+                        }
+                    ),
+                )
+            except pa.ArrowInvalid:
+                # pyarrow rejects rows of varying length, and reports values out of
+                # int64 range the same way, both backends then give the same result
+                return self._read_csv_columns_with_csv_module()
+            columns = []
+            for column in table.columns:
+                if column.null_count > 0:
+                    raise ValueError("Missing values found in heart rate data")
+                columns.append(column.to_numpy())
+            return columns[0], columns[1]
+
+        try:
+            with warnings.catch_warnings():
+                # A header-only file is reported as "no heart rate data"
+                warnings.simplefilter("ignore", UserWarning)
+                data = np.loadtxt(
+                    self.data_path,
+                    delimiter=",",
+                    skiprows=1,
+                    dtype=np.int64,
+                    ndmin=2,
+                )
+        except ValueError:
+            # np.loadtxt rejects quoted fields and rows of varying length
+            return self._read_csv_columns_with_csv_module()
+        if data.size == 0:
+            data = np.empty((0, 2), dtype=np.int64)
+        elif data.shape[1] != 2:
+            return self._read_csv_columns_with_csv_module()
+        return data[:, 0], data[:, 1]
+
+    def _read_csv_columns_with_csv_module(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Read the timestamp_ns and heart_rate_bpm columns with csv.DictReader, slower but lenient."""
+        timestamps_ns = []
+        heart_rate_bpm = []
+        with open(self.data_path, "r", newline="") as csvfile:
+            for row in csv.DictReader(csvfile):
+                timestamps_ns.append(int(row["timestamp_ns"]))
+                heart_rate_bpm.append(int(row["heart_rate_bpm"]))
+        return (
+            np.array(timestamps_ns, dtype=np.int64),
+            np.array(heart_rate_bpm, dtype=np.int64),
+        )
+
+    @property
+    def timestamps_ns(self) -> np.ndarray:
+        """Sorted read-only int64 array of the heart rate timestamps."""
+        return self._timestamps_ns
+
+    @property
+    def heart_rate_data_list(self) -> List[HeartRateData]:
+        """HeartRateData of every entry sorted by timestamp, built on first access.
+
+        Prefer get_heart_rate_arrays(), which does not create one object per entry.
+        """
+        if self._heart_rate_data_list is None:
+            self._heart_rate_data_list = [
+                HeartRateData(timestamp_ns, heart_rate_bpm)
+                for timestamp_ns, heart_rate_bpm in zip(
+                    self._timestamps_ns.tolist(), self._heart_rate_bpm.tolist()
+                )
+            ]
+        return self._heart_rate_data_list
+
     def get_heart_rate_by_index(self, index: int) -> Optional[HeartRateData]:
         """Get heart rate data by index."""
-        if 0 <= index < len(self.heart_rate_data_list):
-            return self.heart_rate_data_list[index]
+        if 0 <= index < self._timestamps_ns.size:
+            return HeartRateData(
+                int(self._timestamps_ns[index]), int(self._heart_rate_bpm[index])
+            )
         else:
             self.logger.warning(
                 "Index %d is out of range (0 to %d). Return None.",
                 index,
-                len(self.heart_rate_data_list) - 1,
+                self._timestamps_ns.size - 1,
             )
         return None
 
@@ -95,11 +185,76 @@ class HeartRateDataProvider:
         time_query_options: TimeQueryOptions = TimeQueryOptions.CLOSEST,
     ) -> Optional[HeartRateData]:
         """Get heart rate data at specified timestamp."""
-        index = find_timestamp_index_by_time_query_option(
-            self.timestamps_ns, timestamp_ns, time_query_options
+        index = find_timestamp_indices_by_time_query_option(
+            self._timestamps_ns, timestamp_ns, time_query_options
+        )
+        return self.get_heart_rate_by_index(int(index))
+
+    def get_heart_rate_bpm_by_timestamps_ns(
+        self,
+        timestamps_ns: np.ndarray,
+        time_query_options: TimeQueryOptions = TimeQueryOptions.CLOSEST,
+    ) -> np.ndarray:
+        """Get heart rate bpm at each of the specified timestamps in a single vectorized query.
+
+        Returns:
+            int64 array of heart rate bpm with the shape of timestamps_ns, -1 where no valid match is found.
+        """
+        indices = find_timestamp_indices_by_time_query_option(
+            self._timestamps_ns, timestamps_ns, time_query_options
+        )
+        return np.where(indices >= 0, self._heart_rate_bpm[indices], -1)
+
+    def get_heart_rate_arrays(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Get all heart rate entries without creating HeartRateData objects.
+
+        Returns:
+            Tuple of (timestamps_ns, heart_rate_bpm) read-only int64 arrays sorted by timestamp.
+        """
+        return self._timestamps_ns, self._heart_rate_bpm
+
+    def get_heart_rate_arrays_by_start_and_end_timestamps(
+        self, start_timestamp_ns: int, end_timestamp_ns: int
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Get all heart rate entries with start_timestamp_ns <= timestamp <= end_timestamp_ns.
+
+        Returns:
+            Tuple of (timestamps_ns, heart_rate_bpm) int64 arrays sorted by timestamp.
+            Both are read-only views into the provider storage.
+        """
+        if end_timestamp_ns < start_timestamp_ns:
+            return self._timestamps_ns[:0], self._heart_rate_bpm[:0]
+
+        # Coarse search on the sparse index to find the blocks covering the range
+        stride = HEART_RATE_COARSE_INDEX_STRIDE
+        first_block = max(
+            int(
+                np.searchsorted(
+                    self._coarse_timestamps_ns, start_timestamp_ns, side="right"
+                )
+            )
+            - 1,
+            0,
+        )
+        end_block = int(
+            np.searchsorted(self._coarse_timestamps_ns, end_timestamp_ns, side="right")
+        )
+        lo = first_block * stride
+        hi = min(end_block * stride, self._timestamps_ns.size)
+
+        # Precise bounds with a dense search restricted to those blocks
+        block_timestamps_ns = self._timestamps_ns[lo:hi]
+        start_idx = lo + int(
+            np.searchsorted(block_timestamps_ns, start_timestamp_ns, side="left")
+        )
+        end_idx = lo + int(
+            np.searchsorted(block_timestamps_ns, end_timestamp_ns, side="right")
+        )
+        return (
+            self._timestamps_ns[start_idx:end_idx],
+            self._heart_rate_bpm[start_idx:end_idx],
         )
-        return self.get_heart_rate_by_index(index)
 
     def get_heart_rate_total_number(self) -> int:
         """Get total number of heart rate entries."""
-        return len(self.heart_rate_data_list)
+        return int(self._timestamps_ns.size)
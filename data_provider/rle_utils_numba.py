@@ -0,0 +1,96 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+# All rights reserved.
+#
+# This source code is licensed under the license found in the
+# LICENSE file in the root directory of this source tree.
+
+"""
+Numba compiled kernels for COCO RLE decoding.
+
+These kernels mirror rleFrString() and rleDecode() from maskApi.c, see rle_utils for the
+format description. Numba is an optional dependency: when it is not installed,
+NUMBA_AVAILABLE is False and rle_utils keeps using its NumPy implementation.
+"""
+
+import numpy as np
+
+try:
+    from numba import njit
+
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+if NUMBA_AVAILABLE:
+
+    # nogil lets annotation parsing threads run this kernel concurrently
+    @njit(cache=True, nogil=True, boundscheck=False)
+    def parse_counts(encoded_bytes: np.ndarray) -> np.ndarray:
+        """
+        Convert COCO compressed string bytes (uint8 array) to RLE counts (int64 array).
+        Compiled equivalent of rle_utils.rle_from_string().
+        """
+        encoded_length = encoded_bytes.shape[0]
+        counts_array = np.empty(encoded_length, dtype=np.int64)
+        num_counts = 0
+        string_position = 0
+
+        while string_position < encoded_length:
+            decoded_value = 0
+            bit_position = 0
+            has_more_bits = True
+
+            # Decode variable-length integer from consecutive characters
+            while has_more_bits and string_position < encoded_length:
+                char_value = np.int64(encoded_bytes[string_position]) - 48
+                decoded_value |= (char_value & 0x1F) << (5 * bit_position)
+                has_more_bits = (char_value & 0x20) != 0
+                string_position += 1
+                bit_position += 1
+
+                # Sign extension for negative numbers (two's complement)
+                if not has_more_bits and (char_value & 0x10):
+                    decoded_value |= np.int64(-1) << (5 * bit_position)
+
+            # Reverse delta encoding: add count from 2 positions back
+            if num_counts > 2:
+                decoded_value += counts_array[num_counts - 2]
+
+            counts_array[num_counts] = decoded_value
+            num_counts += 1
+
+        return counts_array[:num_counts]
+
+    # nogil lets mask decoding threads run this kernel concurrently
+    @njit(cache=True, nogil=True, boundscheck=False)
+    def decode_into(run_length_counts: np.ndarray, mask: np.ndarray) -> None:
+        """
+        Write RLE counts into a preallocated flat uint8 binary mask, in place.
+        Raises ValueError on invalid RLE.
+        """
+        total_pixels = mask.shape[0]
+        mask[:] = 0
+
+        current_position = 0
+        current_value = 0
+        for count in run_length_counts:
+            if count > 0:
+                end_position = current_position + count
+                if end_position > total_pixels:
+                    raise ValueError("Invalid RLE data")
+                if current_value == 1:
+                    for k in range(current_position, end_position):
+                        mask[k] = 1
+                current_position = end_position
+            current_value = 1 - current_value
+
+    @njit(cache=True, nogil=True, boundscheck=False)
+    def decode(run_length_counts: np.ndarray, height: int, width: int) -> np.ndarray:
+        """
+        Convert RLE counts to a flat (height * width) uint8 binary mask.
+        Compiled equivalent of rle_utils.rle_decode(), raises ValueError on invalid RLE.
+        """
+        mask = np.empty(height * width, dtype=np.uint8)
+        decode_into(run_length_counts, mask)
+        return mask
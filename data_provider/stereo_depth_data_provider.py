@@ -23,6 +23,7 @@ from .aria_gen2_pilot_dataset_data_types import CameraIntrinsicsAndPose
 from .utils import (
     check_valid_file,
     find_timestamp_index_by_time_query_option,
+    find_timestamp_indices_by_time_query_option,
     load_image,
 )
 
@@ -35,6 +36,8 @@ class StereoDepthDataProvider:
         self.data_path = data_path
         self.camera_intrinsics_and_pose_list: List[CameraIntrinsicsAndPose] = []
         self.timestamps_ns: List[int] = []
+        # Read-only int64 copy of timestamps_ns, for vectorized queries of many timestamps
+        self._timestamps_ns_array: np.ndarray = np.empty(0, dtype=np.int64)
         self.sorted_to_original_indices: List[
             int
         ] = []  # Maps sorted index to original file index
@@ -149,6 +152,8 @@ class StereoDepthDataProvider:
             raise RuntimeError(
                 "No depth camera data found, can not initialize FoundationStereoDataProvider."
             )
+        self._timestamps_ns_array = np.array(self.timestamps_ns, dtype=np.int64)
+        self._timestamps_ns_array.setflags(write=False)
 
     def _validate_subfolder(self, subfolder_name: str) -> List[str]:
         """Validate that a subfolder exists and contains PNG files."""
@@ -260,6 +265,24 @@ class StereoDepthDataProvider:
         )
         return self.get_stereo_depth_camera_intrinsics_and_pose_by_index(index)
 
+    def get_stereo_depth_camera_intrinsics_and_pose_by_timestamps_ns(
+        self,
+        timestamps_ns: np.ndarray,
+        time_query_option: TimeQueryOptions = TimeQueryOptions.CLOSEST,
+    ) -> List[Optional[CameraIntrinsicsAndPose]]:
+        """Get depth camera info at each of the specified timestamps, with a single vectorized search.
+
+        Returns:
+            List with one entry per queried timestamp, None where no valid match is found.
+        """
+        indices = find_timestamp_indices_by_time_query_option(
+            self._timestamps_ns_array, timestamps_ns, time_query_option
+        )
+        return [
+            self.camera_intrinsics_and_pose_list[index] if index >= 0 else None
+            for index in indices.ravel().tolist()
+        ]
+
     def get_depth_data_total_number(self) -> int:
         """Get total number of depth entries."""
         return len(self.camera_intrinsics_and_pose_list)
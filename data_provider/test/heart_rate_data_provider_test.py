@@ -4,10 +4,14 @@
 # This source code is licensed under the license found in the
 # LICENSE file in the root directory of this source tree.
 
+import contextlib
 import pathlib
 import tempfile
 import unittest
+from unittest import mock
 
+import numpy as np
+from aria_gen2_pilot_dataset.data_provider import heart_rate_data_provider
 from aria_gen2_pilot_dataset.data_provider.heart_rate_data_provider import (
     HeartRateDataProvider,
 )
@@ -123,6 +127,126 @@ class TestHeartRateDataProvider(unittest.TestCase):
         )
         self.assertIsNone(heart_rate_data)
 
+    def test_get_heart_rate_bpm_by_timestamps_ns(self):
+        """Test vectorized heart rate query matches the scalar query."""
+        provider = HeartRateDataProvider(self.temp_file.name)
+        query_timestamps_ns = np.array(
+            [500000000, 2000000000, 2500000000, 2600000000, 6000000000]
+        )
+
+        for option in [
+            TimeQueryOptions.BEFORE,
+            TimeQueryOptions.AFTER,
+            TimeQueryOptions.CLOSEST,
+        ]:
+            with self.subTest(option=option):
+                bpm = provider.get_heart_rate_bpm_by_timestamps_ns(
+                    query_timestamps_ns, option
+                )
+                self.assertEqual(bpm.shape, query_timestamps_ns.shape)
+                for timestamp_ns, value in zip(query_timestamps_ns, bpm):
+                    heart_rate_data = provider.get_heart_rate_by_timestamp_ns(
+                        int(timestamp_ns), option
+                    )
+                    expected = (
+                        heart_rate_data.heart_rate_bpm
+                        if heart_rate_data is not None
+                        else -1
+                    )
+                    self.assertEqual(value, expected)
+
+    def test_get_heart_rate_arrays(self):
+        """Test getting all heart rate entries as read-only sorted arrays."""
+        provider = HeartRateDataProvider(self.temp_file.name)
+
+        timestamps_ns, heart_rate_bpm = provider.get_heart_rate_arrays()
+        self.assertEqual(
+            timestamps_ns.tolist(),
+            [1000000000, 2000000000, 3000000000, 4000000000, 5000000000],
+        )
+        self.assertEqual(heart_rate_bpm.tolist(), [72, 75, 68, 80, 65])
+        with self.assertRaises(ValueError):
+            heart_rate_bpm[0] = 0
+
+    def test_public_attributes(self):
+        """Test the timestamps_ns and heart_rate_data_list attributes kept for existing callers."""
+        provider = HeartRateDataProvider(self.temp_file.name)
+
+        self.assertEqual(
+            provider.timestamps_ns.tolist(),
+            [1000000000, 2000000000, 3000000000, 4000000000, 5000000000],
+        )
+        with self.assertRaises(ValueError):
+            provider.timestamps_ns[0] = 0
+
+        heart_rate_data_list = provider.heart_rate_data_list
+        self.assertIs(provider.heart_rate_data_list, heart_rate_data_list)
+        self.assertEqual(len(heart_rate_data_list), 5)
+        self.assertEqual(heart_rate_data_list[2], provider.get_heart_rate_by_index(2))
+        self.assertEqual(
+            [data.heart_rate_bpm for data in heart_rate_data_list],
+            [72, 75, 68, 80, 65],
+        )
+
+    def test_get_heart_rate_arrays_by_start_and_end_timestamps(self):
+        """Test range query returns the inclusive slice of sorted data."""
+        provider = HeartRateDataProvider(self.temp_file.name)
+
+        timestamps_ns, heart_rate_bpm = (
+            provider.get_heart_rate_arrays_by_start_and_end_timestamps(
+                2000000000, 4000000000
+            )
+        )
+        self.assertEqual(timestamps_ns.tolist(), [2000000000, 3000000000, 4000000000])
+        self.assertEqual(heart_rate_bpm.tolist(), [75, 68, 80])
+
+        # No data in range, or invalid range
+        timestamps_ns, _ = provider.get_heart_rate_arrays_by_start_and_end_timestamps(
+            6000000000, 7000000000
+        )
+        self.assertEqual(len(timestamps_ns), 0)
+        timestamps_ns, _ = provider.get_heart_rate_arrays_by_start_and_end_timestamps(
+            4000000000, 2000000000
+        )
+        self.assertEqual(len(timestamps_ns), 0)
+
+    def test_range_query_across_coarse_index_blocks(self):
+        """Test range query on data spanning multiple coarse index blocks."""
+        num_entries = 20000
+        large_data = "timestamp_ns,heart_rate_bpm\n" + "".join(
+            f"{i * 1000},{60 + i % 40}\n" for i in range(num_entries)
+        )
+        with tempfile.NamedTemporaryFile(mode="w", suffix=".csv", delete=False) as f:
+            f.write(large_data)
+            f.close()
+
+        try:
+            provider = HeartRateDataProvider(f.name)
+            all_timestamps_ns = np.arange(num_entries) * 1000
+            for start_ns, end_ns in [
+                (0, 19999000),
+                (8191000, 8192000),
+                (8191500, 16384500),
+                (-5000, 500),
+                (16383999, 16384001),
+                (19999001, 30000000),
+            ]:
+                with self.subTest(start_ns=start_ns, end_ns=end_ns):
+                    timestamps_ns, heart_rate_bpm = (
+                        provider.get_heart_rate_arrays_by_start_and_end_timestamps(
+                            start_ns, end_ns
+                        )
+                    )
+                    expected = all_timestamps_ns[
+                        (all_timestamps_ns >= start_ns) & (all_timestamps_ns <= end_ns)
+                    ]
+                    self.assertEqual(timestamps_ns.tolist(), expected.tolist())
+                    self.assertEqual(
+                        heart_rate_bpm.tolist(), (60 + expected // 1000 % 40).tolist()
+                    )
+        finally:
+            pathlib.Path(f.name).unlink(missing_ok=True)
+
     def test_get_heart_rate_total_number(self):
         """Test getting total number of heart rate entries."""
         provider = HeartRateDataProvider(self.temp_file.name)
@@ -166,3 +290,65 @@ class TestHeartRateDataProvider(unittest.TestCase):
             or "file does not exist" in error_msg,
             f"Expected file not found error, got: {context.exception}",
         )
+
+    def _load_csv_text(self, csv_text: str) -> HeartRateDataProvider:
+        """Create a provider from csv_text written to a temporary file."""
+        with tempfile.NamedTemporaryFile(mode="w", suffix=".csv", delete=False) as f:
+            f.write(csv_text)
+        self.addCleanup(pathlib.Path(f.name).unlink, missing_ok=True)
+        return HeartRateDataProvider(f.name)
+
+    def _csv_backends(self):
+        """Patches selecting each installed CSV reader of the provider."""
+        backends = {"numpy": mock.patch.object(heart_rate_data_provider, "pa", None)}
+        if heart_rate_data_provider.pa is not None:
+            backends["pyarrow"] = contextlib.nullcontext()
+        return backends.items()
+
+    def test_quoted_and_extra_fields(self):
+        """Test that rows with quoted or extra fields load like with the csv module."""
+        header = "timestamp_ns,heart_rate_bpm\n"
+        for csv_text in (
+            header + '"2000000000","75"\n1000000000,72\n',
+            header + "2000000000,75,extra\n1000000000,72\n",
+            header + "2000000000,75,extra\n1000000000,72,extra\n",
+        ):
+            for backend, backend_patch in self._csv_backends():
+                with self.subTest(csv_text=csv_text, backend=backend), backend_patch:
+                    timestamps_ns, heart_rate_bpm = self._load_csv_text(
+                        csv_text
+                    ).get_heart_rate_arrays()
+                    self.assertEqual(timestamps_ns.tolist(), [1000000000, 2000000000])
+                    self.assertEqual(heart_rate_bpm.tolist(), [72, 75])
+
+    def test_invalid_values(self):
+        """Test that missing values and values not fitting in int64 are rejected."""
+        header = "timestamp_ns,heart_rate_bpm\n"
+        for csv_text in (
+            header + "99999999999999999999,75\n",
+            header + "1000000000,\n",
+        ):
+            for backend, backend_patch in self._csv_backends():
+                with self.subTest(csv_text=csv_text, backend=backend), backend_patch:
+                    with self.assertRaises(RuntimeError):
+                        self._load_csv_text(csv_text)
+
+    def test_duplicate_timestamps(self):
+        """Test provider with duplicate timestamps throws error."""
+        duplicate_data = (
+            "timestamp_ns,heart_rate_bpm\n"
+            "2000000000,75\n"
+            "1000000000,72\n"
+            "2000000000,76\n"
+        )
+
+        with tempfile.NamedTemporaryFile(mode="w", suffix=".csv", delete=False) as f:
+            f.write(duplicate_data)
+            f.close()
+
+        try:
+            with self.assertRaises(RuntimeError) as context:
+                HeartRateDataProvider(f.name)
+            self.assertIn("2000000000", str(context.exception))
+        finally:
+            pathlib.Path(f.name).unlink(missing_ok=True)
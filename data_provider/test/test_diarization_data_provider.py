@@ -4,21 +4,29 @@
 # This source code is licensed under the license found in the
 # LICENSE file in the root directory of this source tree.
 
+import contextlib
+import os
 import tempfile
 import unittest
+from unittest import mock
 
+from aria_gen2_pilot_dataset.data_provider import diarization_data_provider
 from aria_gen2_pilot_dataset.data_provider.diarization_data_provider import (
     DiarizationDataProvider,
 )
 
+# Write temporary CSV files to tmpfs where available (Linux) to avoid disk IO
+TEMP_DIR = "/dev/shm" if os.access("/dev/shm", os.W_OK) else None
+
 
 class TestDiarizationDataProvider(unittest.TestCase):
     """Test suite for DiarizationDataProvider."""
 
-    def setUp(self):
-        """Set up test data and create temporary CSV file."""
+    @classmethod
+    def setUpClass(cls):
+        """Set up read-only test data shared by all tests and create temporary CSV file."""
         # Comprehensive test data with overlapping segments and edge cases
-        self.csv_data = """start_timestamp_ns,end_timestamp_ns,speaker,content
+        cls.csv_data = """start_timestamp_ns,end_timestamp_ns,speaker,content
 1000000000,2000000000,Speaker1,Hello world
 1500000000,2500000000,Speaker2,Good morning overlapping
 2500000000,3500000000,Speaker2,How are you
@@ -28,20 +36,19 @@ class TestDiarizationDataProvider(unittest.TestCase):
 6500000000,7000000000,Speaker1,Goodbye everyone
 """
         # Create temp file with test data
-        self.temp_file = tempfile.NamedTemporaryFile(
-            mode="w", suffix=".csv", delete=False
+        cls.temp_file = tempfile.NamedTemporaryFile(
+            mode="w", suffix=".csv", delete=False, dir=TEMP_DIR
         )
-        self.temp_file.write(self.csv_data)
-        self.temp_file.close()
+        cls.temp_file.write(cls.csv_data)
+        cls.temp_file.close()
 
         # Create provider
-        self.provider = DiarizationDataProvider(self.temp_file.name)
+        cls.provider = DiarizationDataProvider(cls.temp_file.name)
 
-    def tearDown(self):
+    @classmethod
+    def tearDownClass(cls):
         """Clean up temp files."""
-        import os
-
-        os.unlink(self.temp_file.name)
+        os.unlink(cls.temp_file.name)
 
     def test_data_loading_and_structure(self):
         """Test that data loads correctly and maintains structure."""
@@ -174,6 +181,30 @@ class TestDiarizationDataProvider(unittest.TestCase):
         )
         self.assertEqual(len(result), 0)
 
+    def test_has_overlap(self):
+        """Test that has_overlap agrees with the range search result."""
+        for start_timestamp_ns, end_timestamp_ns in [
+            (5100000000, 5400000000),  # gap between segments
+            (100000000, 500000000),  # before all segments
+            (8000000000, 9000000000),  # after all segments
+            (3000000000, 2000000000),  # end < start
+            (1500000000, 1500000000),  # point query
+            (5200000000, 5600000000),  # partial overlap of a single segment
+            (0, 10000000000),  # entire dataset
+        ]:
+            with self.subTest(
+                start_timestamp_ns=start_timestamp_ns, end_timestamp_ns=end_timestamp_ns
+            ):
+                result = self.provider.get_diarization_data_by_start_and_end_timestamps(
+                    start_timestamp_ns, end_timestamp_ns
+                )
+                self.assertEqual(
+                    self.provider.has_overlap(start_timestamp_ns, end_timestamp_ns),
+                    len(result) > 0,
+                )
+        self.assertFalse(self.provider.has_overlap(5100000000, 5400000000))
+        self.assertTrue(self.provider.has_overlap(5200000000, 5600000000))
+
     def test_get_diarization_data_by_start_and_end_timestamps_edge_cases(self):
         """Test range search edge cases."""
         # Query with start == end (point query)
@@ -275,7 +306,7 @@ class TestDiarizationDataProvider(unittest.TestCase):
 
         # Create temp file with unsorted data
         unsorted_file = tempfile.NamedTemporaryFile(
-            mode="w", suffix=".csv", delete=False
+            mode="w", suffix=".csv", delete=False, dir=TEMP_DIR
         )
         unsorted_file.write(unsorted_csv)
         unsorted_file.close()
@@ -296,8 +327,6 @@ class TestDiarizationDataProvider(unittest.TestCase):
             self.assertEqual(result[0].content, "First segment")
 
         finally:
-            import os
-
             os.unlink(unsorted_file.name)
 
     def test_empty_file_handling(self):
@@ -305,7 +334,9 @@ class TestDiarizationDataProvider(unittest.TestCase):
         # Create empty CSV (header only)
         empty_csv = ""
 
-        empty_file = tempfile.NamedTemporaryFile(mode="w", suffix=".csv", delete=False)
+        empty_file = tempfile.NamedTemporaryFile(
+            mode="w", suffix=".csv", delete=False, dir=TEMP_DIR
+        )
         empty_file.write(empty_csv)
         empty_file.close()
 
@@ -322,8 +353,6 @@ class TestDiarizationDataProvider(unittest.TestCase):
             )
 
         finally:
-            import os
-
             os.unlink(empty_file.name)
 
     def test_missing_file_handling(self):
@@ -350,7 +379,7 @@ class TestDiarizationDataProvider(unittest.TestCase):
 """
 
         malformed_file = tempfile.NamedTemporaryFile(
-            mode="w", suffix=".csv", delete=False
+            mode="w", suffix=".csv", delete=False, dir=TEMP_DIR
         )
         malformed_file.write(malformed_csv)
         malformed_file.close()
@@ -370,8 +399,6 @@ class TestDiarizationDataProvider(unittest.TestCase):
             )
 
         finally:
-            import os
-
             os.unlink(malformed_file.name)
 
     def test_invalid_data_types_handling(self):
@@ -383,7 +410,7 @@ not_a_number,2000000000,Speaker1,Invalid start timestamp
 """
 
         invalid_file = tempfile.NamedTemporaryFile(
-            mode="w", suffix=".csv", delete=False
+            mode="w", suffix=".csv", delete=False, dir=TEMP_DIR
         )
         invalid_file.write(invalid_csv)
         invalid_file.close()
@@ -394,10 +421,67 @@ not_a_number,2000000000,Speaker1,Invalid start timestamp
                 DiarizationDataProvider(invalid_file.name)
 
         finally:
-            import os
-
             os.unlink(invalid_file.name)
 
+    def _load_csv_text(self, csv_text: str) -> DiarizationDataProvider:
+        """Create a provider from csv_text written to a temporary file."""
+        with tempfile.NamedTemporaryFile(
+            mode="w", suffix=".csv", delete=False, dir=TEMP_DIR
+        ) as f:
+            f.write(csv_text)
+        self.addCleanup(os.unlink, f.name)
+        return DiarizationDataProvider(f.name)
+
+    def _csv_backends(self):
+        """Patches selecting each installed CSV reader of the provider."""
+        backends = {"csv": mock.patch.object(diarization_data_provider, "pd", None)}
+        if diarization_data_provider.pd is not None:
+            backends["pandas"] = contextlib.nullcontext()
+        return backends.items()
+
+    def test_csv_backends_accept_same_rows(self):
+        """Test that quoted, empty and missing text fields load alike with every CSV reader."""
+        header = "start_timestamp_ns,end_timestamp_ns,speaker,content\n"
+        for csv_text, expected in (
+            (
+                header + '"2000","3000","Speaker2","Hi, there"\n1000,2000,Speaker1,\n',
+                [(1000, 2000, "Speaker1", ""), (2000, 3000, "Speaker2", "Hi, there")],
+            ),
+            (header + "1000,2000,Speaker1\n", [(1000, 2000, "Speaker1", "")]),
+            (header + "1000,2000,NA,nan\n", [(1000, 2000, "NA", "nan")]),
+        ):
+            for backend, backend_patch in self._csv_backends():
+                with self.subTest(csv_text=csv_text, backend=backend), backend_patch:
+                    provider = self._load_csv_text(csv_text)
+                    self.assertEqual(
+                        [
+                            (
+                                data.start_timestamp_ns,
+                                data.end_timestamp_ns,
+                                data.speaker,
+                                data.content,
+                            )
+                            for data in provider.diarization_data
+                        ],
+                        expected,
+                    )
+
+    def test_csv_backends_reject_same_rows(self):
+        """Test that invalid timestamps and extra fields raise RuntimeError with every CSV reader."""
+        header = "start_timestamp_ns,end_timestamp_ns,speaker,content\n"
+        for csv_text in (
+            header + "1000,,Speaker1,Hello\n",
+            header + "1000\n",
+            header + "1000.5,2000,Speaker1,Hello\n",
+            header + "99999999999999999999,2000,Speaker1,Hello\n",
+            header + "1000,2000,3,4,5\n",
+            header + "1000,2000,Speaker1,Hello\n2000,3000,Speaker2,Hi,extra\n",
+        ):
+            for backend, backend_patch in self._csv_backends():
+                with self.subTest(csv_text=csv_text, backend=backend), backend_patch:
+                    with self.assertRaises(RuntimeError):
+                        self._load_csv_text(csv_text)
+
     def test_large_dataset_performance(self):
         """Test performance with larger dataset."""
         # Generate larger test dataset
@@ -413,7 +497,9 @@ not_a_number,2000000000,Speaker1,Invalid start timestamp
 
         large_csv = "\n".join(large_csv_lines)
 
-        large_file = tempfile.NamedTemporaryFile(mode="w", suffix=".csv", delete=False)
+        large_file = tempfile.NamedTemporaryFile(
+            mode="w", suffix=".csv", delete=False, dir=TEMP_DIR
+        )
         large_file.write(large_csv)
         large_file.close()
 
@@ -459,8 +545,6 @@ not_a_number,2000000000,Speaker1,Invalid start timestamp
             self.assertLess(elapsed_time, 0.1, "Range search performance is too slow")
 
         finally:
-            import os
-
             os.unlink(large_file.name)
 
     def test_complex_overlapping_scenarios(self):
@@ -474,7 +558,7 @@ not_a_number,2000000000,Speaker1,Invalid start timestamp
 2500000000,2500000000,Speaker5,Zero duration segment"""
 
         complex_file = tempfile.NamedTemporaryFile(
-            mode="w", suffix=".csv", delete=False
+            mode="w", suffix=".csv", delete=False, dir=TEMP_DIR
         )
         complex_file.write(complex_csv)
         complex_file.close()
@@ -500,6 +584,4 @@ not_a_number,2000000000,Speaker1,Invalid start timestamp
             # Should handle zero-duration segment appropriately
 
         finally:
-            import os
-
             os.unlink(complex_file.name)
@@ -4,15 +4,24 @@
 # This source code is licensed under the license found in the
 # LICENSE file in the root directory of this source tree.
 
+import dataclasses
+import gc
 import json
 import os
+import pickle
 import tempfile
 import unittest
+import weakref
+from unittest import mock
 
 import numpy as np
 from aria_gen2_pilot_dataset.data_provider.aria_gen2_pilot_dataset_data_types import (
     HandObjectInteractionData,
 )
+from aria_gen2_pilot_dataset.data_provider import (
+    hand_object_interaction_data_provider,
+    rle_utils,
+)
 from aria_gen2_pilot_dataset.data_provider.hand_object_interaction_data_provider import (
     HandObjectInteractionDataProvider,
 )
@@ -22,10 +31,11 @@ from projectaria_tools.core.sensor_data import TimeQueryOptions
 class TestHandObjectInteractionDataProvider(unittest.TestCase):
     """Test suite for HandObjectInteractionDataProvider."""
 
-    def setUp(self):
-        """Set up test data and create temporary test file."""
+    @classmethod
+    def setUpClass(cls):
+        """Set up read-only test data shared by all tests and create temporary test file."""
         # Test data mimicking the structure from manifold example
-        self.test_data = [
+        cls.test_data = [
             {
                 "segmentation": {
                     "size": [1512, 2016],
@@ -69,20 +79,21 @@ class TestHandObjectInteractionDataProvider(unittest.TestCase):
         ]
 
         # Create temporary file with test data
-        self.temp_file = tempfile.NamedTemporaryFile(
+        cls.temp_file = tempfile.NamedTemporaryFile(
             mode="w", suffix=".json", delete=False
         )
-        json.dump(self.test_data, self.temp_file)
-        self.temp_file.close()
+        json.dump(cls.test_data, cls.temp_file)
+        cls.temp_file.close()
 
         # Initialize data provider
-        self.provider = HandObjectInteractionDataProvider(
-            self.temp_file.name, rgb_width=2560, rgb_height=1920
+        cls.provider = HandObjectInteractionDataProvider(
+            cls.temp_file.name, rgb_width=2560, rgb_height=1920
         )
 
-    def tearDown(self):
+    @classmethod
+    def tearDownClass(cls):
         """Clean up temporary files."""
-        os.unlink(self.temp_file.name)
+        os.unlink(cls.temp_file.name)
 
     def test_get_hoi_data_by_timestamp_ns(self):
         """Test querying by timestamp."""
@@ -106,8 +117,8 @@ class TestHandObjectInteractionDataProvider(unittest.TestCase):
 
             # Check new decoded format
             self.assertIsInstance(item.masks, list)
-            self.assertIsInstance(item.bboxes, list)
-            self.assertIsInstance(item.scores, list)
+            self.assertIsInstance(item.bboxes, np.ndarray)
+            self.assertIsInstance(item.scores, np.ndarray)
 
             # Each category should have at least one mask/bbox/score
             self.assertGreater(len(item.masks), 0)
@@ -120,6 +131,45 @@ class TestHandObjectInteractionDataProvider(unittest.TestCase):
                 self.assertEqual(mask.shape, (1512, 2016))  # from test data
                 self.assertEqual(mask.dtype, np.uint8)
 
+    def test_get_hoi_data_by_timestamps_ns(self):
+        """Test that batched queries match single timestamp queries."""
+        query_timestamps_ns = np.array(
+            [2620885000000, 2620886000000, 2620886600000, 2620888000000]
+        )
+        for time_query_options in [
+            TimeQueryOptions.BEFORE,
+            TimeQueryOptions.AFTER,
+            TimeQueryOptions.CLOSEST,
+        ]:
+            with self.subTest(time_query_options=time_query_options):
+                batch_data = self.provider.get_hoi_data_by_timestamps_ns(
+                    query_timestamps_ns, time_query_options, resize_masks=False
+                )
+                self.assertEqual(len(batch_data), len(query_timestamps_ns))
+                for timestamp_ns, data in zip(query_timestamps_ns, batch_data):
+                    self.assertIs(
+                        data,
+                        self.provider.get_hoi_data_by_timestamp_ns(
+                            int(timestamp_ns), time_query_options, resize_masks=False
+                        ),
+                    )
+
+    def test_exact_timestamp_lookup(self):
+        """Test that queries at annotated timestamps skip the binary search."""
+        with mock.patch.object(
+            hand_object_interaction_data_provider, "bisect_right_with_hint"
+        ) as bisect_mock:
+            for time_query_options in [
+                TimeQueryOptions.BEFORE,
+                TimeQueryOptions.AFTER,
+                TimeQueryOptions.CLOSEST,
+            ]:
+                data = self.provider.get_hoi_data_by_timestamp_ns(
+                    2620886000000, time_query_options, resize_masks=False
+                )
+                self.assertEqual(data[0].timestamp_ns, 2620886000000)
+        bisect_mock.assert_not_called()
+
     def test_get_hoi_data_by_index(self):
         """Test querying by index."""
         # Test valid index
@@ -131,6 +181,258 @@ class TestHandObjectInteractionDataProvider(unittest.TestCase):
         data = self.provider.get_hoi_data_by_index(999)
         self.assertIsNone(data)
 
+    def test_public_attributes(self):
+        """Test the timestamps_ns and hoi_data_list attributes kept for existing callers."""
+        timestamps_ns = self.provider.timestamps_ns
+        self.assertEqual(timestamps_ns.tolist(), [2620886000000, 2620887000000])
+        with self.assertRaises(ValueError):
+            timestamps_ns[0] = 0
+
+        hoi_data_list = self.provider.hoi_data_list
+        self.assertEqual(len(hoi_data_list), 2)
+        self.assertIs(
+            hoi_data_list[-1],
+            self.provider.get_hoi_data_by_index(1, resize_masks=False),
+        )
+        self.assertEqual(len(hoi_data_list[:1]), 1)
+        self.assertEqual([len(data_list) for data_list in hoi_data_list], [2, 2])
+        with self.assertRaises(IndexError):
+            hoi_data_list[2]
+
+    def test_decoded_data_cache(self):
+        """Test that repeated queries reuse decoded data and resizing does not leak."""
+        resized_data = self.provider.get_hoi_data_by_index(0)
+        self.assertIs(resized_data, self.provider.get_hoi_data_by_index(0))
+        for item in resized_data:
+            for mask in item.masks:
+                self.assertEqual(mask.shape, (1920, 2560))
+
+        # Original resolution masks are unaffected by previous resized queries
+        original_data = self.provider.get_hoi_data_by_index(0, resize_masks=False)
+        for item in original_data:
+            for mask in item.masks:
+                self.assertEqual(mask.shape, (1512, 2016))
+
+    def test_resized_masks_release_full_resolution(self):
+        """Test that resized results do not keep the full resolution mask buffers."""
+        provider = HandObjectInteractionDataProvider(
+            self.temp_file.name, rgb_width=2560, rgb_height=1920
+        )
+        decoded_masks = []
+        original_decode_masks = rle_utils.decode_masks
+
+        def decode_masks(undecoded_data_list):
+            masks = original_decode_masks(undecoded_data_list)
+            decoded_masks.extend(weakref.ref(mask.base) for mask in masks)
+            return masks
+
+        with mock.patch.object(rle_utils, "decode_masks", decode_masks):
+            resized_data = provider.get_hoi_data_by_index(0)
+            for item in resized_data:
+                self.assertEqual(item.masks[0].shape, (1920, 2560))
+        gc.collect()
+        self.assertEqual(len(decoded_masks), 2)
+        self.assertEqual([ref() for ref in decoded_masks], [None, None])
+
+    def test_lazy_mask_decoding(self):
+        """Test that masks given as a callable are decoded once, on first access."""
+        mask = np.zeros((2, 3), dtype=np.uint8)
+        decode_calls = []
+
+        def decode_masks():
+            decode_calls.append(True)
+            return [mask]
+
+        data = HandObjectInteractionData(
+            timestamp_ns=0,
+            category_id=1,
+            masks=decode_masks,
+            bboxes=np.array([[0.0, 0.0, 1.0, 1.0]], dtype=np.float32),
+            scores=np.array([1.0], dtype=np.float32),
+        )
+        self.assertEqual(data.scores.tolist(), [1.0])
+        self.assertEqual(decode_calls, [])
+        self.assertEqual(len(data.masks), 1)
+        np.testing.assert_array_equal(data.masks[0], mask)
+        self.assertIs(data.masks, data.masks)
+        self.assertEqual(len(decode_calls), 1)
+        # Cached masks are shared by all readers, writes must not go unnoticed
+        with self.assertRaises(ValueError):
+            data.masks[0][0, 0] = 1
+
+    def test_repr_and_eq_do_not_decode(self):
+        """Test that repr() and == leave lazy masks undecoded."""
+        decode_calls = []
+
+        def decode_masks():
+            decode_calls.append(True)
+            return [np.zeros((2, 3), dtype=np.uint8)]
+
+        bboxes = np.zeros((1, 4), dtype=np.float32)
+        scores = np.ones(1, dtype=np.float32)
+        data = HandObjectInteractionData(
+            timestamp_ns=0,
+            category_id=1,
+            masks=decode_masks,
+            bboxes=bboxes,
+            scores=scores,
+        )
+        other = HandObjectInteractionData(
+            timestamp_ns=0,
+            category_id=1,
+            masks=decode_masks,
+            bboxes=bboxes,
+            scores=scores,
+        )
+        self.assertNotIn("masks", repr(data))
+        self.assertEqual(data, other)
+        self.assertEqual(decode_calls, [])
+
+    def test_dataclass_helpers(self):
+        """Test that dataclasses.replace and asdict see lazily decoded masks."""
+        mask = np.ones((2, 3), dtype=np.uint8)
+        data = HandObjectInteractionData(
+            timestamp_ns=0,
+            category_id=1,
+            masks=lambda: [mask],
+            bboxes=np.zeros((1, 4), dtype=np.float32),
+            scores=np.ones(1, dtype=np.float32),
+        )
+        replaced = dataclasses.replace(data, category_id=2)
+        self.assertEqual(replaced.category_id, 2)
+        np.testing.assert_array_equal(replaced.masks[0], mask)
+        data_dict = dataclasses.asdict(data)
+        self.assertEqual(
+            list(data_dict),
+            ["timestamp_ns", "category_id", "masks", "bboxes", "scores"],
+        )
+        np.testing.assert_array_equal(data_dict["masks"][0], mask)
+
+    def test_packed_masks(self):
+        """Test that masks round-trip through bit-packing, for widths not multiple of 8."""
+        mask = (np.arange(3 * 11).reshape(3, 11) % 3 == 0).astype(np.uint8)
+        data = HandObjectInteractionData(
+            timestamp_ns=0,
+            category_id=1,
+            masks=[np.asfortranarray(mask)],
+            bboxes=np.zeros((1, 4), dtype=np.float32),
+            scores=np.ones(1, dtype=np.float32),
+        )
+        self.assertEqual(data.packed_masks[0].shape, (3, 2))
+        self.assertEqual(data.masks[0].dtype, np.uint8)
+        np.testing.assert_array_equal(data.masks[0], mask)
+
+    def test_packed_masks_without_decoded_cache(self):
+        """Test that packing lazy masks does not keep the decoded masks."""
+        mask = np.eye(3, 9, dtype=np.uint8)
+        decode_calls = []
+
+        def decode_masks():
+            decode_calls.append(True)
+            return [mask.copy()]
+
+        data = HandObjectInteractionData(
+            timestamp_ns=0,
+            category_id=1,
+            masks=decode_masks,
+            bboxes=np.zeros((1, 4), dtype=np.float32),
+            scores=np.ones(1, dtype=np.float32),
+        )
+        packed_mask = data.packed_masks[0]
+        self.assertIs(data.packed_masks[0], packed_mask)
+        self.assertNotIn("masks", vars(data))
+        np.testing.assert_array_equal(
+            np.unpackbits(packed_mask, axis=-1, count=9), mask
+        )
+        # masks decodes again on its first access
+        np.testing.assert_array_equal(data.masks[0], mask)
+        self.assertEqual(len(decode_calls), 2)
+
+    def test_raw_data_storage(self):
+        """Test that raw records share segmentation sizes and reference the bbox table."""
+        first_raw, second_raw = (
+            self.provider.hoi_raw_data_list[0][0],
+            self.provider.hoi_raw_data_list[1][0],
+        )
+        self.assertEqual(first_raw.segmentation_size, (1512, 2016))
+        self.assertIs(first_raw.segmentation_size, second_raw.segmentation_size)
+        np.testing.assert_allclose(
+            self.provider._bboxes[first_raw.bbox_index],
+            [1050.18, 738.11, 325.16, 535.08],
+            rtol=1e-6,
+        )
+
+        # Slotted records carry no per-instance __dict__ and still pickle
+        self.assertFalse(hasattr(first_raw, "__dict__"))
+        unpickled_raw = pickle.loads(pickle.dumps(first_raw))
+        self.assertEqual(unpickled_raw.segmentation_size, first_raw.segmentation_size)
+        np.testing.assert_array_equal(
+            unpickled_raw.segmentation_runs, first_raw.segmentation_runs
+        )
+
+    def test_unsorted_annotations(self):
+        """Test that annotations out of timestamp order are grouped in original order."""
+        unsorted_file = tempfile.NamedTemporaryFile(
+            mode="w", suffix=".json", delete=False
+        )
+        json.dump(self.test_data[::-1], unsorted_file)
+        unsorted_file.close()
+
+        try:
+            provider = HandObjectInteractionDataProvider(
+                unsorted_file.name, rgb_width=2560, rgb_height=1920
+            )
+            self.assertEqual(provider.get_hoi_total_number(), 2)
+            for index, expected_image_id in enumerate([2620886, 2620887]):
+                raw_data_list = provider.hoi_raw_data_list[index]
+                self.assertEqual(
+                    [raw_data.original_image_id for raw_data in raw_data_list],
+                    [expected_image_id, expected_image_id],
+                )
+            # Annotations of a timestamp keep their order in the file
+            self.assertEqual(
+                [raw_data.category_id for raw_data in provider.hoi_raw_data_list[0]],
+                [1, 3],
+            )
+        finally:
+            os.unlink(unsorted_file.name)
+
+    def test_large_annotation_file(self):
+        """Test that parsing large files in parallel chunks keeps annotation order."""
+        num_annotations = 5000
+        annotations = [
+            {
+                "segmentation": {"size": [2, 3], "counts": "123"},
+                "bbox": [0.0, 0.0, 1.0, 2.0],
+                "score": (i % 100) / 100.0,
+                "image_id": 1000 + i // 10,
+                "category_id": 3,
+            }
+            for i in range(num_annotations)
+        ]
+        large_file = tempfile.NamedTemporaryFile(mode="w", suffix=".json", delete=False)
+        json.dump(annotations, large_file)
+        large_file.close()
+
+        try:
+            # Force several parse chunks regardless of the machine running the test
+            with mock.patch("os.cpu_count", return_value=4):
+                provider = HandObjectInteractionDataProvider(
+                    large_file.name, rgb_width=3, rgb_height=2
+                )
+            self.assertEqual(provider.get_hoi_total_number(), num_annotations // 10)
+            data = provider.get_hoi_data_by_index(
+                provider.get_hoi_total_number() - 1, resize_masks=False
+            )
+            self.assertEqual(data[0].timestamp_ns, (1000 + 499) * 1_000_000)
+            np.testing.assert_allclose(
+                data[0].scores,
+                [(i % 100) / 100.0 for i in range(4990, 5000)],
+                rtol=1e-6,
+            )
+        finally:
+            os.unlink(large_file.name)
+
     def test_time_query_options(self):
         """Test different time query options."""
         # Test CLOSEST with exact match
@@ -179,8 +481,8 @@ class TestHandObjectInteractionDataProvider(unittest.TestCase):
             self.assertIsInstance(item.timestamp_ns, int)
             self.assertIsInstance(item.category_id, int)
             self.assertIsInstance(item.masks, list)
-            self.assertIsInstance(item.bboxes, list)
-            self.assertIsInstance(item.scores, list)
+            self.assertIsInstance(item.bboxes, np.ndarray)
+            self.assertIsInstance(item.scores, np.ndarray)
 
             # Check valid categories
             self.assertIn(item.category_id, [1, 2, 3])
@@ -191,15 +493,15 @@ class TestHandObjectInteractionDataProvider(unittest.TestCase):
             self.assertGreater(len(item.masks), 0)  # At least one instance per category
 
             # Check bbox format [x, y, width, height]
+            self.assertEqual(item.bboxes.dtype, np.float32)
             for bbox in item.bboxes:
                 self.assertEqual(len(bbox), 4)
                 for val in bbox:
-                    self.assertIsInstance(val, (int, float))
                     self.assertGreaterEqual(val, 0)
 
             # Check score range
+            self.assertEqual(item.scores.dtype, np.float32)
             for score in item.scores:
-                self.assertIsInstance(score, float)
                 self.assertGreaterEqual(score, 0.0)
                 self.assertLessEqual(score, 1.0)
 
@@ -224,6 +526,69 @@ class TestHandObjectInteractionDataProvider(unittest.TestCase):
         finally:
             os.unlink(empty_file.name)
 
+    @unittest.skipIf(
+        hand_object_interaction_data_provider.orjson is None, "orjson not installed"
+    )
+    def test_memory_mapped_loading(self):
+        """Test that memory-mapped parsing of large files loads the same data."""
+        with mock.patch.object(
+            hand_object_interaction_data_provider, "HOI_MMAP_LOAD_MIN_FILE_SIZE", 0
+        ):
+            provider = HandObjectInteractionDataProvider(
+                self.temp_file.name, rgb_width=2560, rgb_height=1920
+            )
+        self.assertEqual(
+            provider.get_hoi_total_number(), self.provider.get_hoi_total_number()
+        )
+        np.testing.assert_array_equal(
+            provider.get_hoi_data_by_index(1, resize_masks=False)[0].scores,
+            self.provider.get_hoi_data_by_index(1, resize_masks=False)[0].scores,
+        )
+
+    @unittest.skipIf(
+        hand_object_interaction_data_provider.ijson is None, "ijson not installed"
+    )
+    def test_streaming_loading(self):
+        """Test that streaming large files with ijson loads the same data."""
+        with mock.patch.object(
+            hand_object_interaction_data_provider, "HOI_STREAMING_LOAD_MIN_FILE_SIZE", 0
+        ), mock.patch.object(
+            hand_object_interaction_data_provider, "HOI_STREAMING_BATCH_SIZE", 3
+        ):
+            provider = HandObjectInteractionDataProvider(
+                self.temp_file.name, rgb_width=2560, rgb_height=1920
+            )
+        self.assertEqual(
+            provider.get_hoi_total_number(), self.provider.get_hoi_total_number()
+        )
+        for index in range(provider.get_hoi_total_number()):
+            for data, expected in zip(
+                provider.get_hoi_data_by_index(index, resize_masks=False),
+                self.provider.get_hoi_data_by_index(index, resize_masks=False),
+            ):
+                np.testing.assert_array_equal(data.bboxes, expected.bboxes)
+                np.testing.assert_array_equal(data.scores, expected.scores)
+
+    @unittest.skipIf(
+        hand_object_interaction_data_provider.ijson is None, "ijson not installed"
+    )
+    def test_streaming_loading_non_array(self):
+        """Test that streaming rejects a top level other than an array, like in-memory loading."""
+        with tempfile.NamedTemporaryFile(mode="w", suffix=".json", delete=False) as f:
+            json.dump({"annotations": self.test_data}, f)
+        self.addCleanup(os.unlink, f.name)
+        errors = []
+        for streaming_min_file_size in (0, 1 << 62):
+            with mock.patch.object(
+                hand_object_interaction_data_provider,
+                "HOI_STREAMING_LOAD_MIN_FILE_SIZE",
+                streaming_min_file_size,
+            ), self.assertRaises(RuntimeError) as context:
+                HandObjectInteractionDataProvider(f.name, rgb_width=0, rgb_height=0)
+            errors.append(str(context.exception))
+        self.assertEqual(errors[0], errors[1])
+        self.assertIn("not an array", errors[0])
+
     def test_missing_file_handling(self):
         """Test behavior with missing file."""
         with self.assertRaises(FileNotFoundError):
@@ -0,0 +1,187 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+# All rights reserved.
+#
+# This source code is licensed under the license found in the
+# LICENSE file in the root directory of this source tree.
+
+"""Unit tests for rle_utils.py module."""
+
+import unittest
+from unittest import mock
+
+import numpy as np
+import pytest
+
+from aria_gen2_pilot_dataset.data_provider import rle_utils
+from aria_gen2_pilot_dataset.data_provider.aria_gen2_pilot_dataset_data_types import (
+    HandObjectInteractionDataRaw,
+)
+
+
+class TestDecodeCocoRleToMask(unittest.TestCase):
+    """Test cases for decode_coco_rle_to_mask function."""
+
+    def test_decode_column_major(self) -> None:
+        """Test that counts are expanded in column-major order."""
+        # counts [1, 2, 3]: 1 background, 2 foreground, 3 background pixels
+        mask = rle_utils.decode_coco_rle_to_mask({"size": [2, 3], "counts": "123"})
+        expected = np.array([[0, 1, 0], [1, 0, 0]], dtype=np.uint8)
+        np.testing.assert_array_equal(mask, expected)
+        self.assertEqual(mask.dtype, np.uint8)
+
+    def test_decode_leading_foreground(self) -> None:
+        """Test masks starting with foreground, encoded with an empty first run."""
+        # counts [0, 2, 2]: 0 background, 2 foreground, 2 background pixels
+        mask = rle_utils.decode_coco_rle_to_mask({"size": [2, 2], "counts": "022"})
+        expected = np.array([[1, 0], [1, 0]], dtype=np.uint8)
+        np.testing.assert_array_equal(mask, expected)
+
+    def test_decode_invalid_rle(self) -> None:
+        """Test that counts overflowing the mask size are rejected."""
+        with self.assertRaises(ValueError):
+            rle_utils.decode_coco_rle_to_mask({"size": [2, 2], "counts": "05"})
+
+    def test_decode_uncompressed_counts(self) -> None:
+        """Test that uncompressed list counts decode like the compressed string."""
+        mask = rle_utils.decode_coco_rle_to_mask({"size": [2, 3], "counts": [1, 2, 3]})
+        expected = rle_utils.decode_coco_rle_to_mask({"size": [2, 3], "counts": "123"})
+        np.testing.assert_array_equal(mask, expected)
+
+    def test_matches_pycocotools(self) -> None:
+        """Test that the numba and NumPy decoders match the pycocotools reference."""
+        coco_mask = pytest.importorskip("pycocotools.mask")
+        rng = np.random.default_rng(0)
+        rle_objects = []
+        for height, width in [(1, 1), (2, 3), (7, 5), (16, 33)]:
+            for density in (0.0, 0.1, 0.5, 1.0):
+                mask = np.asfortranarray(rng.random((height, width)) < density)
+                rle_objects.append(coco_mask.encode(mask.astype(np.uint8)))
+        for numba_available in sorted({False, rle_utils.NUMBA_AVAILABLE}):
+            with mock.patch.object(rle_utils, "NUMBA_AVAILABLE", numba_available):
+                for rle_obj in rle_objects:
+                    with self.subTest(numba=numba_available, rle_obj=rle_obj):
+                        mask = rle_utils.decode_coco_rle_to_mask(
+                            {
+                                "size": rle_obj["size"],
+                                "counts": rle_obj["counts"].decode("ascii"),
+                            }
+                        )
+                        np.testing.assert_array_equal(mask, coco_mask.decode(rle_obj))
+
+    def test_invalid_rle_like_pycocotools(self) -> None:
+        """Test that counts overflowing the mask size are rejected like pycocotools does."""
+        coco_mask = pytest.importorskip("pycocotools.mask")
+        for counts in ("05", "0:", "9"):
+            with self.subTest(counts=counts):
+                with self.assertRaises(ValueError):
+                    coco_mask.decode({"size": [2, 2], "counts": counts.encode()})
+                with self.assertRaises(ValueError):
+                    rle_utils.decode_coco_rle_to_mask(
+                        {"size": [2, 2], "counts": counts}
+                    )
+
+
+class TestRleFromBytes(unittest.TestCase):
+    """Test cases for rle_from_bytes function."""
+
+    def test_matches_rle_from_string(self) -> None:
+        """Test that the vectorized parser matches the maskApi.c translation."""
+        rng = np.random.default_rng(0)
+        for _ in range(200):
+            # Integers of 1 to 6 characters, all but the last with the continuation bit
+            chars = []
+            for value_length in rng.integers(1, 7, size=rng.integers(0, 20)):
+                chars.extend(48 + (rng.integers(0, 32, size=value_length - 1) | 0x20))
+                chars.append(48 + rng.integers(0, 32))
+            encoded_string = bytes(chars).decode("latin-1")
+            with self.subTest(encoded_string=encoded_string):
+                counts = rle_utils.rle_from_bytes(
+                    np.frombuffer(encoded_string.encode("latin-1"), dtype=np.uint8)
+                )
+                self.assertEqual(counts.dtype, np.int64)
+                self.assertEqual(
+                    counts.tolist(), rle_utils.rle_from_string(encoded_string, 0, 0)
+                )
+
+    def test_parse_delta_encoded_counts(self) -> None:
+        """Test multi-character and delta encoded counts."""
+        # "X1": low bits 8 with the continuation bit, then 1 << 5, so 40
+        # "L": 28 with the sign bit, so -4
+        # ":": 10 plus the count 2 positions back, so 50
+        counts = rle_utils.rle_from_bytes(np.frombuffer(b"3X1L:", dtype=np.uint8))
+        self.assertEqual(counts.tolist(), [3, 40, -4, 50])
+
+
+class TestRleCountsToMask(unittest.TestCase):
+    """Test cases for rle_counts_to_mask function."""
+
+    def test_decode_into_buffer(self) -> None:
+        """Test decoding into a transposed slice of a preallocated mask buffer."""
+        mask_buffer = np.full((2, 3, 2), 7, dtype=np.uint8)
+        counts = np.array([1, 2, 3], dtype=np.int32)
+        mask = rle_utils.rle_counts_to_mask(counts, 2, 3, out=mask_buffer[1].T)
+        self.assertTrue(np.shares_memory(mask, mask_buffer))
+        np.testing.assert_array_equal(mask, rle_utils.rle_counts_to_mask(counts, 2, 3))
+        # Other masks of the buffer are untouched
+        np.testing.assert_array_equal(mask_buffer[0], 7)
+
+    def test_decode_into_row_major_buffer(self) -> None:
+        """Test that an out array not matching the RLE layout is rejected."""
+        with self.assertRaises(ValueError):
+            rle_utils.rle_counts_to_mask(
+                np.array([1, 2, 3], dtype=np.int32),
+                2,
+                3,
+                out=np.empty((2, 3), dtype=np.uint8),
+            )
+
+
+class TestDecodeMasks(unittest.TestCase):
+    """Test cases for decode_masks function."""
+
+    def _make_raw_data(self, counts, size) -> HandObjectInteractionDataRaw:
+        return HandObjectInteractionDataRaw(
+            timestamp_ns=0,
+            original_image_id=0,
+            category_id=1,
+            bbox_index=0,
+            segmentation_size=size,
+            segmentation_runs=np.array(counts, dtype=np.int32),
+            score=1.0,
+        )
+
+    def test_parallel_decode_matches_serial(self) -> None:
+        """Test that masks decoded on the thread pool keep their order and values."""
+        raw_data_list = [
+            self._make_raw_data([1, 2, 3], (2, 3)),
+            self._make_raw_data([0, 2, 2], (2, 2)),
+            self._make_raw_data([3, 3], (2, 3)),
+        ]
+        with mock.patch.object(rle_utils, "_decode_executor", None):
+            with mock.patch.object(rle_utils, "RLE_PARALLEL_DECODE_MIN_MASKS", 10):
+                serial_masks = rle_utils.decode_masks(raw_data_list)
+            # The thread pool is only created by the first parallel decode
+            self.assertIsNone(rle_utils._decode_executor)
+            with mock.patch.object(
+                rle_utils, "RLE_PARALLEL_DECODE_MIN_MASKS", 0
+            ), mock.patch("os.cpu_count", return_value=4):
+                parallel_masks = rle_utils.decode_masks(raw_data_list)
+            self.assertIsNotNone(rle_utils._decode_executor)
+        self.assertEqual(len(parallel_masks), len(raw_data_list))
+        for parallel_mask, serial_mask in zip(parallel_masks, serial_masks):
+            np.testing.assert_array_equal(parallel_mask, serial_mask)
+        np.testing.assert_array_equal(
+            parallel_masks[0], np.array([[0, 1, 0], [1, 0, 0]], dtype=np.uint8)
+        )
+
+    def test_parallel_decode_invalid_rle(self) -> None:
+        """Test that decoding errors of pool threads are raised to the caller."""
+        raw_data_list = [
+            self._make_raw_data([1, 2, 3], (2, 3)),
+            self._make_raw_data([0, 5], (2, 2)),
+        ]
+        with mock.patch.object(
+            rle_utils, "RLE_PARALLEL_DECODE_MIN_MASKS", 0
+        ), mock.patch("os.cpu_count", return_value=4):
+            with self.assertRaises(ValueError):
+                rle_utils.decode_masks(raw_data_list)
@@ -0,0 +1,103 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+# All rights reserved.
+#
+# This source code is licensed under the license found in the
+# LICENSE file in the root directory of this source tree.
+
+import json
+import os
+import tempfile
+import unittest
+
+import numpy as np
+from aria_gen2_pilot_dataset.data_provider.aria_gen2_pilot_data_file_keys import (
+    STEREO_DEPTH_DEPTH_SUBFOLDER,
+    STEREO_DEPTH_PINHOLE_CAMERA_PARAMETERS_FILE,
+    STEREO_DEPTH_RECTIFIED_IMAGES_SUBFOLDER,
+)
+from aria_gen2_pilot_dataset.data_provider.stereo_depth_data_provider import (
+    StereoDepthDataProvider,
+)
+from projectaria_tools.core.sensor_data import TimeQueryOptions
+
+
+class TestStereoDepthDataProvider(unittest.TestCase):
+    """Test suite for StereoDepthDataProvider."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Create a temporary depth data directory with unsorted camera parameters."""
+        cls.temp_dir = tempfile.TemporaryDirectory()
+        cls.timestamps_ns = [3000, 1000, 2000]
+        camera_json = [
+            {
+                "frameTimestampNs": timestamp_ns,
+                "T_world_camera": {
+                    "QuaternionXYZW": [0.0, 0.0, 0.0, 1.0],
+                    "Translation": [float(timestamp_ns), 0.0, 0.0],
+                },
+                "camera": {
+                    "ModelName": "Linear:fu,fv,u0,v0",
+                    "Parameters": [500.0, 500.0, 320.0, 240.0],
+                },
+            }
+            for timestamp_ns in cls.timestamps_ns
+        ]
+        with open(
+            os.path.join(
+                cls.temp_dir.name, STEREO_DEPTH_PINHOLE_CAMERA_PARAMETERS_FILE
+            ),
+            "w",
+        ) as f:
+            json.dump(camera_json, f)
+        # Only the presence of PNG files is checked on initialization
+        for subfolder in (
+            STEREO_DEPTH_DEPTH_SUBFOLDER,
+            STEREO_DEPTH_RECTIFIED_IMAGES_SUBFOLDER,
+        ):
+            os.makedirs(os.path.join(cls.temp_dir.name, subfolder))
+            open(os.path.join(cls.temp_dir.name, subfolder, "0.png"), "w").close()
+
+        cls.provider = StereoDepthDataProvider(cls.temp_dir.name)
+
+    @classmethod
+    def tearDownClass(cls):
+        """Clean up the temporary directory."""
+        cls.temp_dir.cleanup()
+
+    def test_sorted_loading(self):
+        """Test that camera parameters are sorted by timestamp."""
+        self.assertEqual(self.provider.timestamps_ns, [1000, 2000, 3000])
+        self.assertEqual(self.provider.sorted_to_original_indices, [1, 2, 0])
+        self.assertEqual(self.provider.get_depth_data_total_number(), 3)
+
+    def test_get_camera_intrinsics_and_pose_by_timestamps_ns(self):
+        """Test that batched queries match single timestamp queries, out of range ones included."""
+        query_timestamps_ns = np.array(
+            [0, 999, 1000, 1499, 1500, 1501, 2000, 3000, 3001, 10000]
+        )
+        for time_query_option in [
+            TimeQueryOptions.BEFORE,
+            TimeQueryOptions.AFTER,
+            TimeQueryOptions.CLOSEST,
+        ]:
+            with self.subTest(time_query_option=time_query_option):
+                batch_data = self.provider.get_stereo_depth_camera_intrinsics_and_pose_by_timestamps_ns(
+                    query_timestamps_ns, time_query_option
+                )
+                self.assertEqual(len(batch_data), len(query_timestamps_ns))
+                for timestamp_ns, data in zip(query_timestamps_ns.tolist(), batch_data):
+                    self.assertIs(
+                        data,
+                        self.provider.get_stereo_depth_camera_intrinsics_and_pose_by_timestamp_ns(
+                            timestamp_ns, time_query_option
+                        ),
+                    )
+                if time_query_option == TimeQueryOptions.BEFORE:
+                    self.assertIsNone(batch_data[0])
+                elif time_query_option == TimeQueryOptions.AFTER:
+                    self.assertIsNone(batch_data[-1])
+                else:
+                    # Ties go to the earlier timestamp
+                    self.assertEqual(batch_data[4].timestamp_ns, 1000)
+
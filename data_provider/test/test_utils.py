@@ -6,183 +6,317 @@
 
 """Unit tests for utils.py module."""
 
+import os
+import tempfile
 import unittest
+from unittest import mock
 
+import numpy as np
+import pytest
+
+from aria_gen2_pilot_dataset.data_provider import utils
 from aria_gen2_pilot_dataset.data_provider.utils import (
+    bisect_right_with_hint,
+    check_valid_file,
     find_timestamp_index_by_time_query_option,
+    find_timestamp_index_by_upper_bound,
+    find_timestamp_indices_by_time_query_option,
 )
 
 from projectaria_tools.core.sensor_data import TimeQueryOptions
 
+# Test data format: (timestamps, target_timestamp, option, expected_result, description)
+# Each test case verified by manual calculation based on bisect logic
+TIME_QUERY_TEST_CASES = [
+    # Empty list tests - function returns -1 for empty lists
+    ([], 300, TimeQueryOptions.BEFORE, -1, "empty_before"),
+    ([], 300, TimeQueryOptions.AFTER, -1, "empty_after"),
+    ([], 300, TimeQueryOptions.CLOSEST, -1, "empty_closest"),
+    # BEFORE option tests - finds last timestamp <= target
+    # timestamps: [100, 200, 300, 400, 500] (indices 0, 1, 2, 3, 4)
+    (
+        [100, 200, 300, 400, 500],
+        300,
+        TimeQueryOptions.BEFORE,
+        2,
+        "before_exact_match",
+    ),  # 300 at index 2
+    (
+        [100, 200, 300, 400, 500],
+        250,
+        TimeQueryOptions.BEFORE,
+        1,
+        "before_between_values",
+    ),  # last <= 250 is 200 at index 1
+    (
+        [100, 200, 300, 400, 500],
+        50,
+        TimeQueryOptions.BEFORE,
+        -1,
+        "before_too_small",
+    ),  # no timestamp <= 50
+    (
+        [100, 200, 300, 400, 500],
+        600,
+        TimeQueryOptions.BEFORE,
+        4,
+        "before_after_all",
+    ),  # last <= 600 is 500 at index 4
+    # AFTER option tests - finds first timestamp >= target
+    (
+        [100, 200, 300, 400, 500],
+        300,
+        TimeQueryOptions.AFTER,
+        2,
+        "after_exact_match",
+    ),  # 300 at index 2
+    (
+        [100, 200, 300, 400, 500],
+        250,
+        TimeQueryOptions.AFTER,
+        2,
+        "after_between_values",
+    ),  # first >= 250 is 300 at index 2
+    (
+        [100, 200, 300, 400, 500],
+        50,
+        TimeQueryOptions.AFTER,
+        0,
+        "after_before_all",
+    ),  # first >= 50 is 100 at index 0
+    (
+        [100, 200, 300, 400, 500],
+        600,
+        TimeQueryOptions.AFTER,
+        -1,
+        "after_too_large",
+    ),  # no timestamp >= 600
+    # CLOSEST option tests - finds closest timestamp, prefer earlier on ties
+    (
+        [100, 200, 300, 400, 500],
+        300,
+        TimeQueryOptions.CLOSEST,
+        2,
+        "closest_exact_match",
+    ),  # exact match at index 2
+    (
+        [100, 200, 300, 400, 500],
+        220,
+        TimeQueryOptions.CLOSEST,
+        1,
+        "closest_to_200",
+    ),  # |220-200|=20 < |220-300|=80
+    (
+        [100, 200, 300, 400, 500],
+        280,
+        TimeQueryOptions.CLOSEST,
+        2,
+        "closest_to_300",
+    ),  # |280-300|=20 < |280-200|=80
+    (
+        [100, 200, 300, 400, 500],
+        250,
+        TimeQueryOptions.CLOSEST,
+        1,
+        "closest_equidistant",
+    ),  # |250-200|=50 = |250-300|=50, prefer earlier
+    (
+        [100, 200, 300, 400, 500],
+        50,
+        TimeQueryOptions.CLOSEST,
+        0,
+        "closest_before_all",
+    ),  # closest is 100 at index 0
+    (
+        [100, 200, 300, 400, 500],
+        600,
+        TimeQueryOptions.CLOSEST,
+        4,
+        "closest_after_all",
+    ),  # closest is 500 at index 4
+    # Edge cases - single element
+    (
+        [300],
+        300,
+        TimeQueryOptions.BEFORE,
+        0,
+        "single_exact_before",
+    ),  # 300 <= 300, return index 0
+    (
+        [300],
+        200,
+        TimeQueryOptions.BEFORE,
+        -1,
+        "single_too_small_before",
+    ),  # no timestamp <= 200
+    (
+        [300],
+        400,
+        TimeQueryOptions.AFTER,
+        -1,
+        "single_too_large_after",
+    ),  # no timestamp >= 400
+    (
+        [300],
+        400,
+        TimeQueryOptions.CLOSEST,
+        0,
+        "single_closest",
+    ),  # only option is index 0
+    # Duplicates - test bisect behavior with repeated values
+    # timestamps: [100, 200, 200, 300] (indices 0, 1, 2, 3)
+    (
+        [100, 200, 200, 300],
+        200,
+        TimeQueryOptions.BEFORE,
+        2,
+        "duplicate_before",
+    ),  # bisect_right finds rightmost position
+    (
+        [100, 200, 200, 300],
+        200,
+        TimeQueryOptions.AFTER,
+        1,
+        "duplicate_after",
+    ),  # bisect_left finds leftmost position
+]
+
+
+@pytest.mark.parametrize(
+    "timestamps, target, option, expected, description",
+    TIME_QUERY_TEST_CASES,
+    ids=[case[-1] for case in TIME_QUERY_TEST_CASES],
+)
+def test_find_timestamp_index_by_time_query_option(
+    timestamps, target, option, expected, description
+) -> None:
+    """Test all scenarios of find_timestamp_index_by_time_query_option, one case per test."""
+    result = find_timestamp_index_by_time_query_option(timestamps, target, option)
+    assert isinstance(result, int)
+    assert (
+        result == expected
+    ), f"Failed for {description}: expected {expected}, got {result}"
+
+
+class TestFindTimestampIndicesByTimeQueryOption(unittest.TestCase):
+    """Test cases for find_timestamp_indices_by_time_query_option function."""
 
-class TestFindTimestampIndexByTimeQueryOption(unittest.TestCase):
-    """Test cases for find_timestamp_index_by_time_query_option function."""
-
-    def test_all_scenarios(self) -> None:
-        """Test all scenarios using data arrays."""
-        # Test data format: (timestamps, target_timestamp, option, expected_result, description)
-        # Each test case verified by manual calculation based on bisect logic
-        test_cases = [
-            # Empty list tests - function returns -1 for empty lists
-            ([], 300, TimeQueryOptions.BEFORE, -1, "empty_before"),
-            ([], 300, TimeQueryOptions.AFTER, -1, "empty_after"),
-            ([], 300, TimeQueryOptions.CLOSEST, -1, "empty_closest"),
-            # BEFORE option tests - finds last timestamp <= target
-            # timestamps: [100, 200, 300, 400, 500] (indices 0, 1, 2, 3, 4)
-            (
-                [100, 200, 300, 400, 500],
-                300,
-                TimeQueryOptions.BEFORE,
-                2,
-                "before_exact_match",
-            ),  # 300 at index 2
-            (
-                [100, 200, 300, 400, 500],
-                250,
-                TimeQueryOptions.BEFORE,
-                1,
-                "before_between_values",
-            ),  # last <= 250 is 200 at index 1
-            (
-                [100, 200, 300, 400, 500],
-                50,
-                TimeQueryOptions.BEFORE,
-                -1,
-                "before_too_small",
-            ),  # no timestamp <= 50
-            (
-                [100, 200, 300, 400, 500],
-                600,
-                TimeQueryOptions.BEFORE,
-                4,
-                "before_after_all",
-            ),  # last <= 600 is 500 at index 4
-            # AFTER option tests - finds first timestamp >= target
-            (
-                [100, 200, 300, 400, 500],
-                300,
-                TimeQueryOptions.AFTER,
-                2,
-                "after_exact_match",
-            ),  # 300 at index 2
-            (
-                [100, 200, 300, 400, 500],
-                250,
-                TimeQueryOptions.AFTER,
-                2,
-                "after_between_values",
-            ),  # first >= 250 is 300 at index 2
-            (
-                [100, 200, 300, 400, 500],
-                50,
-                TimeQueryOptions.AFTER,
-                0,
-                "after_before_all",
-            ),  # first >= 50 is 100 at index 0
-            (
-                [100, 200, 300, 400, 500],
-                600,
-                TimeQueryOptions.AFTER,
-                -1,
-                "after_too_large",
-            ),  # no timestamp >= 600
-            # CLOSEST option tests - finds closest timestamp, prefer earlier on ties
-            (
-                [100, 200, 300, 400, 500],
-                300,
-                TimeQueryOptions.CLOSEST,
-                2,
-                "closest_exact_match",
-            ),  # exact match at index 2
-            (
-                [100, 200, 300, 400, 500],
-                220,
-                TimeQueryOptions.CLOSEST,
-                1,
-                "closest_to_200",
-            ),  # |220-200|=20 < |220-300|=80
-            (
-                [100, 200, 300, 400, 500],
-                280,
-                TimeQueryOptions.CLOSEST,
-                2,
-                "closest_to_300",
-            ),  # |280-300|=20 < |280-200|=80
-            (
-                [100, 200, 300, 400, 500],
-                250,
-                TimeQueryOptions.CLOSEST,
-                1,
-                "closest_equidistant",
-            ),  # |250-200|=50 = |250-300|=50, prefer earlier
-            (
-                [100, 200, 300, 400, 500],
-                50,
-                TimeQueryOptions.CLOSEST,
-                0,
-                "closest_before_all",
-            ),  # closest is 100 at index 0
-            (
-                [100, 200, 300, 400, 500],
-                600,
-                TimeQueryOptions.CLOSEST,
-                4,
-                "closest_after_all",
-            ),  # closest is 500 at index 4
-            # Edge cases - single element
-            (
-                [300],
-                300,
-                TimeQueryOptions.BEFORE,
-                0,
-                "single_exact_before",
-            ),  # 300 <= 300, return index 0
-            (
-                [300],
-                200,
-                TimeQueryOptions.BEFORE,
-                -1,
-                "single_too_small_before",
-            ),  # no timestamp <= 200
-            (
-                [300],
-                400,
-                TimeQueryOptions.AFTER,
-                -1,
-                "single_too_large_after",
-            ),  # no timestamp >= 400
-            (
-                [300],
-                400,
-                TimeQueryOptions.CLOSEST,
-                0,
-                "single_closest",
-            ),  # only option is index 0
-            # Duplicates - test bisect behavior with repeated values
-            # timestamps: [100, 200, 200, 300] (indices 0, 1, 2, 3)
-            (
-                [100, 200, 200, 300],
-                200,
-                TimeQueryOptions.BEFORE,
-                2,
-                "duplicate_before",
-            ),  # bisect_right finds rightmost position
-            (
-                [100, 200, 200, 300],
-                200,
-                TimeQueryOptions.AFTER,
-                1,
-                "duplicate_after",
-            ),  # bisect_left finds leftmost position
-        ]
-
-        for timestamps, target, option, expected, description in test_cases:
+    def test_matches_scalar_scenarios(self) -> None:
+        """Test each scalar scenario as a single target and within batched targets."""
+        for (
+            timestamps,
+            target,
+            option,
+            expected,
+            description,
+        ) in TIME_QUERY_TEST_CASES:
             with self.subTest(case=description):
-                result = find_timestamp_index_by_time_query_option(
-                    timestamps, target, option
+                timestamps_ns = np.asarray(timestamps, dtype=np.int64)
+                result = find_timestamp_indices_by_time_query_option(
+                    timestamps_ns, target, option
                 )
-                self.assertEqual(
-                    result,
-                    expected,
-                    f"Failed for {description}: expected {expected}, got {result}",
+                self.assertEqual(result.shape, ())
+                self.assertEqual(int(result), expected)
+
+        # Batch all targets sharing the same timestamps and option in one query
+        batches = {}
+        for timestamps, target, option, expected, _ in TIME_QUERY_TEST_CASES:
+            batch = batches.setdefault((tuple(timestamps), option), ([], []))
+            batch[0].append(target)
+            batch[1].append(expected)
+        for (timestamps, option), (targets, expected) in batches.items():
+            with self.subTest(timestamps=timestamps, option=option):
+                result = find_timestamp_indices_by_time_query_option(
+                    np.asarray(timestamps, dtype=np.int64),
+                    np.asarray(targets, dtype=np.int64),
+                    option,
                 )
+                self.assertEqual(result.tolist(), expected)
+
+    @unittest.skipUnless(utils.NUMBA_AVAILABLE, "numba is not installed")
+    def test_parallel_kernel_matches_searchsorted(self) -> None:
+        """Test that batches split across threads match the np.searchsorted path."""
+        rng = np.random.default_rng(0)
+        # Duplicates and ties between neighbours on the coarse grid
+        timestamps_ns = np.sort(rng.integers(0, 500, size=200) * 10)
+        targets_ns = rng.integers(-100, 5100, size=(40, 25))
+        for option in (
+            TimeQueryOptions.BEFORE,
+            TimeQueryOptions.AFTER,
+            TimeQueryOptions.CLOSEST,
+        ):
+            with self.subTest(option=option):
+                with mock.patch.object(
+                    utils, "TIMESTAMP_QUERY_PARALLEL_MIN_TARGETS", targets_ns.size + 1
+                ):
+                    expected = find_timestamp_indices_by_time_query_option(
+                        timestamps_ns, targets_ns, option
+                    )
+                with mock.patch.object(
+                    utils, "TIMESTAMP_QUERY_PARALLEL_MIN_TARGETS", 0
+                ), mock.patch("os.cpu_count", return_value=4):
+                    result = find_timestamp_indices_by_time_query_option(
+                        timestamps_ns, targets_ns, option
+                    )
+                self.assertEqual(result.dtype, np.int64)
+                np.testing.assert_array_equal(result, expected)
+
+
+class TestFindTimestampIndexByUpperBound(unittest.TestCase):
+    """Test cases for bisect_right_with_hint and find_timestamp_index_by_upper_bound functions."""
+
+    def test_matches_binary_search(self) -> None:
+        """Test that every hint gives the same index as find_timestamp_index_by_time_query_option."""
+        for timestamps in [[], [300], [100, 200, 300, 400, 500]]:
+            for target in [50, 100, 220, 250, 280, 300, 500, 600]:
+                for option in [
+                    TimeQueryOptions.BEFORE,
+                    TimeQueryOptions.AFTER,
+                    TimeQueryOptions.CLOSEST,
+                ]:
+                    expected = find_timestamp_index_by_time_query_option(
+                        timestamps, target, option
+                    )
+                    for hint in range(len(timestamps) + 2):
+                        with self.subTest(
+                            timestamps=timestamps,
+                            target=target,
+                            option=option,
+                            hint=hint,
+                        ):
+                            upper_bound = bisect_right_with_hint(
+                                timestamps, target, hint
+                            )
+                            self.assertEqual(
+                                find_timestamp_index_by_upper_bound(
+                                    timestamps, target, upper_bound, option
+                                ),
+                                expected,
+                            )
+
+
+class TestCheckValidFile(unittest.TestCase):
+    """Test cases for check_valid_file function."""
+
+    def test_invalid_paths(self) -> None:
+        """Test that missing, non-regular and empty files are rejected."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            empty_file_path = os.path.join(temp_dir, "empty.csv")
+            open(empty_file_path, "w").close()
+            for file_path, message in [
+                (os.path.join(temp_dir, "missing.csv"), "File does not exist"),
+                (os.path.join(empty_file_path, "missing.csv"), "File does not exist"),
+                (temp_dir, "Path is not a file"),
+                (empty_file_path, "File is empty"),
+            ]:
+                with self.subTest(file_path=file_path):
+                    with self.assertRaisesRegex(RuntimeError, message):
+                        check_valid_file(file_path)
+
+    def test_valid_file(self) -> None:
+        """Test that a non-empty regular file passes."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            file_path = os.path.join(temp_dir, "data.csv")
+            with open(file_path, "w") as f:
+                f.write("timestamp_ns,heart_rate_bpm\n")
+            check_valid_file(file_path)
@@ -6,44 +6,188 @@
 
 """Utility functions for Aria Gen2 Pilot Dataset data providers."""
 
-import bisect
 import os
-from typing import Any, List, Tuple
+import stat
+from bisect import bisect_left, bisect_right
+from typing import Any, List, Sequence, Tuple, Union
 
 import numpy as np
 from PIL import Image
 from projectaria_tools.core.sensor_data import TimeQueryOptions
 
+from .utils_numba import NUMBA_AVAILABLE
+
+if NUMBA_AVAILABLE:
+    from . import utils_numba
+
+# Batched queries split targets across threads from this many targets on
+TIMESTAMP_QUERY_PARALLEL_MIN_TARGETS = 1 << 16
+
 
 def find_timestamp_index_by_time_query_option(
-    timestamps_ns: List[int],
+    timestamps_ns: Sequence[int],
     target_timestamp_ns: int,
     time_query_option: TimeQueryOptions,
 ) -> int:
     """Find best matching timestamp index using binary search."""
+    return _TIME_QUERY_OPTION_HANDLERS.get(time_query_option, _find_closest_index)(
+        timestamps_ns, target_timestamp_ns
+    )
+
+
+def _find_before_index(timestamps_ns: Sequence[int], target_timestamp_ns: int) -> int:
+    """Index of the last timestamp <= target, -1 if none."""
+    return bisect_right(timestamps_ns, target_timestamp_ns) - 1
+
+
+def _find_after_index(timestamps_ns: Sequence[int], target_timestamp_ns: int) -> int:
+    """Index of the first timestamp >= target, -1 if none."""
+    idx = bisect_left(timestamps_ns, target_timestamp_ns)
+    return idx if idx < len(timestamps_ns) else -1
+
+
+def _find_closest_index(timestamps_ns: Sequence[int], target_timestamp_ns: int) -> int:
+    """Index of the closest timestamp, the earlier one on ties, -1 if empty."""
     if not timestamps_ns:
         return -1
+    idx = bisect_left(timestamps_ns, target_timestamp_ns)
+    if idx == 0:
+        return 0
+    if idx == len(timestamps_ns):
+        return len(timestamps_ns) - 1
+    # Step back to the earlier timestamp when it is as close, without a branch
+    take_earlier = int(
+        target_timestamp_ns - timestamps_ns[idx - 1]
+        <= timestamps_ns[idx] - target_timestamp_ns
+    )
+    return idx - take_earlier
+
+
+# One dict lookup instead of comparing against each option, unknown options are CLOSEST
+_TIME_QUERY_OPTION_HANDLERS = {
+    TimeQueryOptions.BEFORE: _find_before_index,
+    TimeQueryOptions.AFTER: _find_after_index,
+    TimeQueryOptions.CLOSEST: _find_closest_index,
+}
+
+if NUMBA_AVAILABLE:
+    # Small int codes of the time query options, passed to the numba kernel
+    _TIME_QUERY_OPTION_CODES = {
+        TimeQueryOptions.BEFORE: utils_numba.TIME_QUERY_BEFORE,
+        TimeQueryOptions.AFTER: utils_numba.TIME_QUERY_AFTER,
+        TimeQueryOptions.CLOSEST: utils_numba.TIME_QUERY_CLOSEST,
+    }
+
+
+def find_timestamp_indices_by_time_query_option(
+    timestamps_ns: np.ndarray,
+    target_timestamps_ns: Union[int, np.ndarray],
+    time_query_option: TimeQueryOptions,
+) -> np.ndarray:
+    """Vectorized find_timestamp_index_by_time_query_option using np.searchsorted.
+
+    Args:
+        timestamps_ns: Sorted int64 array of timestamps
+        target_timestamps_ns: Target timestamp, or array of target timestamps, to search for
+        time_query_option: Search strategy (BEFORE, AFTER, CLOSEST)
+
+    Returns:
+        int64 array of best match indices with the shape of target_timestamps_ns, -1 where no valid match is found
+    """
+    target_timestamps_ns = np.asarray(target_timestamps_ns, dtype=np.int64)
+    num_timestamps = timestamps_ns.shape[0]
+    if num_timestamps == 0:
+        return np.full(target_timestamps_ns.shape, -1, dtype=np.int64)
+
+    # np.searchsorted runs on a single thread, large batches are split across cores
+    if (
+        NUMBA_AVAILABLE
+        and target_timestamps_ns.size >= TIMESTAMP_QUERY_PARALLEL_MIN_TARGETS
+        and (os.cpu_count() or 1) > 1
+    ):
+        return utils_numba.find_timestamp_indices(
+            np.ascontiguousarray(timestamps_ns, dtype=np.int64),
+            target_timestamps_ns.ravel(),
+            _TIME_QUERY_OPTION_CODES.get(
+                time_query_option, utils_numba.TIME_QUERY_CLOSEST
+            ),
+        ).reshape(target_timestamps_ns.shape)
 
     if time_query_option == TimeQueryOptions.BEFORE:
-        idx = bisect.bisect_right(timestamps_ns, target_timestamp_ns)
-        return idx - 1 if idx > 0 else -1
+        # -1 where all timestamps are after the target
+        return np.searchsorted(timestamps_ns, target_timestamps_ns, side="right") - 1
     elif time_query_option == TimeQueryOptions.AFTER:
-        idx = bisect.bisect_left(timestamps_ns, target_timestamp_ns)
-        return idx if idx < len(timestamps_ns) else -1
+        idx = np.searchsorted(timestamps_ns, target_timestamps_ns, side="left")
+        return np.where(idx < num_timestamps, idx, -1)
     else:  # TimeQueryOptions.CLOSEST
-        idx = bisect.bisect_left(timestamps_ns, target_timestamp_ns)
-        if idx == 0:
-            return 0
-        if idx == len(timestamps_ns):
-            return len(timestamps_ns) - 1
-        return (
-            idx - 1
-            if target_timestamp_ns - timestamps_ns[idx - 1]
-            <= timestamps_ns[idx] - target_timestamp_ns
-            else idx
+        idx = np.searchsorted(timestamps_ns, target_timestamps_ns, side="left")
+        left = np.clip(idx - 1, 0, num_timestamps - 1)
+        right = np.clip(idx, 0, num_timestamps - 1)
+        # Prefer the earlier timestamp on ties
+        return np.where(
+            target_timestamps_ns - timestamps_ns[left]
+            <= timestamps_ns[right] - target_timestamps_ns,
+            left,
+            right,
         )
 
 
+def bisect_right_with_hint(
+    sorted_values: Union[Sequence[int], np.ndarray], value: int, hint: int
+) -> int:
+    """Get the number of sorted_values <= value, e.g. bisect.bisect_right.
+
+    Sequential queries with increasing values usually resolve to the previous result
+    (hint) or the next position, both are checked in O(1) before a binary search.
+    """
+    num_values = len(sorted_values)
+    for upper_bound in (hint, hint + 1):
+        if (
+            0 <= upper_bound <= num_values
+            and (upper_bound == 0 or sorted_values[upper_bound - 1] <= value)
+            and (upper_bound == num_values or value < sorted_values[upper_bound])
+        ):
+            return upper_bound
+    if isinstance(sorted_values, np.ndarray):
+        return int(np.searchsorted(sorted_values, value, side="right"))
+    return bisect_right(sorted_values, value)
+
+
+def find_timestamp_index_by_upper_bound(
+    timestamps_ns: Union[Sequence[int], np.ndarray],
+    target_timestamp_ns: int,
+    upper_bound: int,
+    time_query_option: TimeQueryOptions,
+) -> int:
+    """Resolve the best matching timestamp index from the number of timestamps <= target.
+
+    Same result as find_timestamp_index_by_time_query_option for strictly increasing
+    timestamps_ns, given upper_bound obtained e.g. with bisect_right_with_hint.
+    """
+    num_timestamps = len(timestamps_ns)
+    if num_timestamps == 0:
+        return -1
+
+    if time_query_option == TimeQueryOptions.BEFORE:
+        return upper_bound - 1
+    if upper_bound > 0 and timestamps_ns[upper_bound - 1] == target_timestamp_ns:
+        # Exact match
+        return upper_bound - 1
+    if time_query_option == TimeQueryOptions.AFTER:
+        return upper_bound if upper_bound < num_timestamps else -1
+    # TimeQueryOptions.CLOSEST
+    if upper_bound == 0:
+        return 0
+    if upper_bound == num_timestamps:
+        return num_timestamps - 1
+    return (
+        upper_bound - 1
+        if target_timestamp_ns - timestamps_ns[upper_bound - 1]
+        <= timestamps_ns[upper_bound] - target_timestamp_ns
+        else upper_bound
+    )
+
+
 def find_data_by_timestamp_ns(
     timestamps_data: List[Tuple[int, Any]],
     target_timestamp_ns: int,
@@ -84,18 +228,19 @@ def check_valid_file(file_path: str) -> None:
     if not file_path or not isinstance(file_path, str):
         raise RuntimeError("Invalid file path: path must be a non-empty string")
 
-    if not os.path.exists(file_path):
+    # A single stat call answers existence, file type and size
+    try:
+        file_stat = os.stat(file_path)
+    except (FileNotFoundError, NotADirectoryError):
         raise RuntimeError(f"File does not exist: {file_path}")
+    except OSError as e:
+        raise RuntimeError(f"Error checking file size: {file_path} - {e}")
 
-    if not os.path.isfile(file_path):
+    if not stat.S_ISREG(file_stat.st_mode):
         raise RuntimeError(f"Path is not a file: {file_path}")
 
-    try:
-        file_size = os.path.getsize(file_path)
-        if file_size == 0:
-            raise RuntimeError(f"File is empty: {file_path}")
-    except OSError as e:
-        raise RuntimeError(f"Error checking file size: {file_path} - {e}")
+    if file_stat.st_size == 0:
+        raise RuntimeError(f"File is empty: {file_path}")
 
 
 def check_valid_csv(file_path: str, expected_headers: str) -> None:
@@ -108,7 +253,8 @@ def check_valid_csv(file_path: str, expected_headers: str) -> None:
     Raises:
         RuntimeError: If file is invalid or headers don't match
     """
-    # First check if file is valid
+    # First check if file is valid, then only the header line is read, malformed rows
+    # are reported by the data provider while parsing
     check_valid_file(file_path)
 
     try:
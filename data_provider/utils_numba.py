@@ -0,0 +1,101 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+# All rights reserved.
+#
+# This source code is licensed under the license found in the
+# LICENSE file in the root directory of this source tree.
+
+"""
+Numba compiled kernels for timestamp queries.
+
+Time query options are passed as the small int codes below. Numba is an optional
+dependency: when it is not installed, NUMBA_AVAILABLE is False and utils keeps using its
+NumPy implementation.
+"""
+
+import numpy as np
+
+try:
+    from numba import njit, prange
+
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+# Codes of TimeQueryOptions.BEFORE, AFTER and CLOSEST
+TIME_QUERY_BEFORE = 0
+TIME_QUERY_AFTER = 1
+TIME_QUERY_CLOSEST = 2
+
+
+if NUMBA_AVAILABLE:
+
+    @njit(cache=True, nogil=True, boundscheck=False)
+    def lower_bound(timestamps_ns: np.ndarray, target_timestamp_ns: int) -> int:
+        """Number of timestamps < target, e.g. bisect.bisect_left."""
+        lo = 0
+        hi = timestamps_ns.shape[0]
+        while lo < hi:
+            mid = (lo + hi) >> 1
+            if timestamps_ns[mid] < target_timestamp_ns:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    @njit(cache=True, nogil=True, boundscheck=False)
+    def upper_bound(timestamps_ns: np.ndarray, target_timestamp_ns: int) -> int:
+        """Number of timestamps <= target, e.g. bisect.bisect_right."""
+        lo = 0
+        hi = timestamps_ns.shape[0]
+        while lo < hi:
+            mid = (lo + hi) >> 1
+            if timestamps_ns[mid] <= target_timestamp_ns:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    @njit(cache=True, nogil=True, boundscheck=False)
+    def find_timestamp_index(
+        timestamps_ns: np.ndarray, target_timestamp_ns: int, time_query_option: int
+    ) -> int:
+        """
+        Compiled equivalent of utils.find_timestamp_index_by_time_query_option() on a sorted
+        int64 array, -1 where no valid match is found.
+        """
+        num_timestamps = timestamps_ns.shape[0]
+        if num_timestamps == 0:
+            return -1
+        if time_query_option == TIME_QUERY_BEFORE:
+            return upper_bound(timestamps_ns, target_timestamp_ns) - 1
+        idx = lower_bound(timestamps_ns, target_timestamp_ns)
+        if time_query_option == TIME_QUERY_AFTER:
+            return idx if idx < num_timestamps else -1
+        if idx == 0:
+            return 0
+        if idx == num_timestamps:
+            return num_timestamps - 1
+        # Prefer the earlier timestamp on ties, as a select instead of a branch
+        take_earlier = int(
+            target_timestamp_ns - timestamps_ns[idx - 1]
+            <= timestamps_ns[idx] - target_timestamp_ns
+        )
+        return idx - take_earlier
+
+    @njit(cache=True, nogil=True, parallel=True, boundscheck=False)
+    def find_timestamp_indices(
+        timestamps_ns: np.ndarray,
+        target_timestamps_ns: np.ndarray,
+        time_query_option: int,
+    ) -> np.ndarray:
+        """
+        find_timestamp_index() of each of the 1D target_timestamps_ns (int64 array), with the
+        targets split across threads.
+        """
+        num_targets = target_timestamps_ns.shape[0]
+        indices = np.empty(num_targets, dtype=np.int64)
+        for i in prange(num_targets):
+            indices[i] = find_timestamp_index(
+                timestamps_ns, target_timestamps_ns[i], time_query_option
+            )
+        return indices
@@ -6,6 +6,7 @@
 
 import logging
 from functools import partial
+from io import BytesIO
 from typing import Dict
 
 import numpy as np
@@ -35,7 +36,50 @@ from . import plot_color
 
 from .aria_gen2_pilot_viewer_config import AriaGen2PilotViewerConfig
 from .plot_style import get_plot_style, PlotEntity, PlotStyle
-from .plot_utils import extract_bbox_projection_data, project_3d_bbox_to_2d_camera
+from .plot_utils import (
+    extract_bbox_projection_data,
+    project_3d_bbox_to_2d_camera,
+    subsample_depth_map,
+)
+
+try:
+    # turbojpeg is an optional accelerator (SIMD libjpeg-turbo), fall back to PIL when missing
+    from turbojpeg import TJPF_GRAY, TJPF_RGB, TJSAMP_420, TJSAMP_GRAY, TurboJPEG
+
+    # Created once, loading the libjpeg-turbo library is not free
+    _turbo_jpeg = TurboJPEG()
+except (ImportError, OSError, RuntimeError):
+    _turbo_jpeg = None
+
+
+def _encode_jpeg(frame: np.ndarray, jpeg_quality: int) -> bytes:
+    """Encode a uint8 grayscale (H, W) or RGB (H, W, 3) frame to JPEG bytes."""
+    if _turbo_jpeg is not None:
+        if frame.ndim == 2:
+            return _turbo_jpeg.encode(
+                frame,
+                quality=jpeg_quality,
+                pixel_format=TJPF_GRAY,
+                jpeg_subsample=TJSAMP_GRAY,
+            )
+        return _turbo_jpeg.encode(
+            frame,
+            quality=jpeg_quality,
+            pixel_format=TJPF_RGB,
+            jpeg_subsample=TJSAMP_420,
+        )
+
+    output = BytesIO()
+    # Baseline 4:2:0 encoding without the extra Huffman optimization pass
+    Image.fromarray(frame).save(
+        output,
+        format="JPEG",
+        quality=jpeg_quality,
+        optimize=False,
+        progressive=False,
+        subsampling=2,
+    )
+    return output.getvalue()
 
 
 class AriaGen2PilotDataVisualizer:
@@ -231,6 +275,10 @@ class AriaGen2PilotDataVisualizer:
         # Plot static components
         self.plot_static_components()
 
+        # Config is immutable, read it once instead of on every frame
+        rgb_jpeg_quality = self.config.rgb_jpeg_quality
+        depth_and_slam_jpeg_quality = self.config.depth_and_slam_jpeg_quality
+
         for data in tqdm(vrs_data_provider.deliver_queued_sensor_data(deliver_option)):
             device_time_ns = data.get_time_ns(TimeDomain.DEVICE_TIME)
             rr.set_time_nanos("device_time", device_time_ns)
@@ -246,9 +294,9 @@ class AriaGen2PilotDataVisualizer:
                 self.plot_image(
                     frame=frame,
                     camera_label=stream_label,
-                    jpeg_quality=self.config.rgb_jpeg_quality
+                    jpeg_quality=rgb_jpeg_quality
                     if stream_label == self.RGB_CAMERA_LABEL
-                    else self.config.depth_and_slam_jpeg_quality,
+                    else depth_and_slam_jpeg_quality,
                 )
 
                 # Project and plot hand tracking result for each image frame
@@ -411,9 +459,17 @@ class AriaGen2PilotDataVisualizer:
             f"{camera_label}",
             rr.Clear.recursive(),
         )
+        if frame.dtype == np.uint8 and (
+            frame.ndim == 2 or (frame.ndim == 3 and frame.shape[2] == 3)
+        ):
+            image = rr.EncodedImage(
+                contents=_encode_jpeg(frame, jpeg_quality), media_type="image/jpeg"
+            )
+        else:
+            image = rr.Image(frame).compress(jpeg_quality)
         rr.log(
             f"{camera_label}",
-            rr.Image(frame).compress(jpeg_quality),
+            image,
         )
 
     # === MPS related plotting functions ===
@@ -422,13 +478,14 @@ class AriaGen2PilotDataVisualizer:
     ) -> None:
         if point_cloud_data == []:
             return
-        points_array = np.array(
-            [
-                point.position_world
-                for point in point_cloud_data
-                if hasattr(point, "position_world")
-            ]
-        )
+        # Gathered as float32 like the Rerun positions, so logging does not convert them
+        positions = np.empty((len(point_cloud_data), 3), dtype=np.float32)
+        num_points = 0
+        for point in point_cloud_data:
+            if hasattr(point, "position_world"):
+                positions[num_points] = point.position_world
+                num_points += 1
+        points_array = positions[:num_points]
         plot_style = get_plot_style(PlotEntity.SEMI_DENSE_POINT_CLOUD)
         rr.log(
             f"world/{plot_style.label}",
@@ -994,7 +1051,13 @@ class AriaGen2PilotDataVisualizer:
         scaled_ux = original_ux / factor
         scaled_uy = original_uy / factor
 
-        subsampled_depth_map = self._resize_image(depth_map, factor)
+        if isinstance(factor, int) and factor > 1:
+            # Take every factor-th pixel: reads only 1/factor^2 of the map, keeps measured
+            # depths instead of interpolating across depth edges, and maps pixel i to
+            # factor * i as the intrinsics scaling above assumes
+            subsampled_depth_map = subsample_depth_map(depth_map, factor)
+        else:
+            subsampled_depth_map = self._resize_image(depth_map, factor)
 
         rr.log(
             f"world/{plot_style.label}",
@@ -10,7 +10,13 @@ import logging
 from aria_gen2_pilot_dataset import AriaGen2PilotDataProvider
 
 from .aria_gen2_pilot_data_visualizer import AriaGen2PilotDataVisualizer
-from .aria_gen2_pilot_viewer_config import AriaGen2PilotViewerConfig
+from .aria_gen2_pilot_viewer_config import (
+    AriaGen2PilotViewerConfig,
+    DEFAULT_DEPTH_AND_SLAM_JPEG_QUALITY,
+    DEFAULT_RGB_DOWNSAMPLE_FACTOR,
+    DEFAULT_RGB_JPEG_QUALITY,
+    DEFAULT_SLAM_DOWNSAMPLE_FACTOR,
+)
 
 
 class ColoredFormatter(logging.Formatter):
@@ -58,6 +64,7 @@ def setup_logging_format() -> None:
 
 
 def parse_args():
+    # Defaults come from the viewer config module, so both stay in sync
     parser = argparse.ArgumentParser()
     parser.add_argument(
         "--sequence-path", type=str, required=True, help="path to sequence folder"
@@ -86,28 +93,28 @@ def parse_args():
         "--rgb-jpeg-quality",
         type=int,
         required=False,
-        default=50,
+        default=DEFAULT_RGB_JPEG_QUALITY,
         help="RGB Jpeg quality (0-100)",
     )
     parser.add_argument(
         "--depth-and-slam-jpeg-quality",
         type=int,
         required=False,
-        default=50,
-        help="RGB Jpeg quality (0-100)",
+        default=DEFAULT_DEPTH_AND_SLAM_JPEG_QUALITY,
+        help="Depth and SLAM Jpeg quality (0-100)",
     )
     parser.add_argument(
         "--rgb-downsample-factor",
         type=int,
         required=False,
-        default=2,
+        default=DEFAULT_RGB_DOWNSAMPLE_FACTOR,
         help="Downsample factor for RGB images before logging to Rerun",
     )
     parser.add_argument(
         "--slam-downsample-factor",
         type=int,
         required=False,
-        default=4,
+        default=DEFAULT_SLAM_DOWNSAMPLE_FACTOR,
         help="Downsample factor for SLAM images before logging to Rerun",
     )
     return parser.parse_args()
@@ -126,11 +133,12 @@ def main():
     data_provider = AriaGen2PilotDataProvider(args.sequence_path)
 
     # Create and initialize visualizer
-    config = AriaGen2PilotViewerConfig()
-    config.rgb_jpeg_quality = args.rgb_jpeg_quality
-    config.depth_and_slam_jpeg_quality = args.depth_and_slam_jpeg_quality
-    config.rgb_downsample_factor = args.rgb_downsample_factor
-    config.slam_downsample_factor = args.slam_downsample_factor
+    config = AriaGen2PilotViewerConfig(
+        rgb_jpeg_quality=args.rgb_jpeg_quality,
+        depth_and_slam_jpeg_quality=args.depth_and_slam_jpeg_quality,
+        rgb_downsample_factor=args.rgb_downsample_factor,
+        slam_downsample_factor=args.slam_downsample_factor,
+    )
     visualizer = AriaGen2PilotDataVisualizer(data_provider, config)
 
     logger.info("Initializing visualization...")
@@ -5,21 +5,33 @@
 # LICENSE file in the root directory of this source tree.
 
 from dataclasses import dataclass
+from typing import Final
 
+# Default viewer settings, also used as the command line defaults
+DEFAULT_RGB_JPEG_QUALITY: Final[int] = 50
+DEFAULT_DEPTH_AND_SLAM_JPEG_QUALITY: Final[int] = 50
+DEFAULT_RGB_DOWNSAMPLE_FACTOR: Final[int] = 2
+DEFAULT_SLAM_DOWNSAMPLE_FACTOR: Final[int] = 4
+DEFAULT_DEPTH_IMAGE_DOWNSAMPLE_FACTOR: Final[int] = 4
+DEFAULT_POINT_CLOUD_MAX_POINT_COUNT: Final[int] = 30000
 
-@dataclass
+
+@dataclass(frozen=True)
 class AriaGen2PilotViewerConfig:
-    """Configuration class for AriaGen2PilotDataVisualizer."""
+    """Configuration class for AriaGen2PilotDataVisualizer.
+
+    Immutable, use dataclasses.replace() to derive a config with different settings.
+    """
 
     # === Memory Optimization Settings ===
     # Reduce image quality for memory savings
-    rgb_jpeg_quality: int = 50
-    depth_and_slam_jpeg_quality: int = 50
+    rgb_jpeg_quality: int = DEFAULT_RGB_JPEG_QUALITY
+    depth_and_slam_jpeg_quality: int = DEFAULT_DEPTH_AND_SLAM_JPEG_QUALITY
 
     # Downsample images before logging
-    rgb_downsample_factor: int = 2
-    slam_downsample_factor: int = 4
-    depth_image_downsample_factor: int = 4
+    rgb_downsample_factor: int = DEFAULT_RGB_DOWNSAMPLE_FACTOR
+    slam_downsample_factor: int = DEFAULT_SLAM_DOWNSAMPLE_FACTOR
+    depth_image_downsample_factor: int = DEFAULT_DEPTH_IMAGE_DOWNSAMPLE_FACTOR
 
     # Point cloud memory optimization
-    point_cloud_max_point_count: int = 30000
+    point_cloud_max_point_count: int = DEFAULT_POINT_CLOUD_MAX_POINT_COUNT
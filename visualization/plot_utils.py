@@ -9,6 +9,16 @@ import numpy as np
 from . import plot_color
 
 
+def subsample_depth_map(depth_map: np.ndarray, factor: int) -> np.ndarray:
+    """
+    Take every factor-th pixel of depth_map, as a contiguous (height // factor, width // factor) array.
+    The map is first cropped to a multiple of factor, so pixel i maps to pixel factor * i.
+    """
+    height = depth_map.shape[0] // factor * factor
+    width = depth_map.shape[1] // factor * factor
+    return np.ascontiguousarray(depth_map[:height:factor, :width:factor])
+
+
 def _sample_points_on_3d_line(start, end, num_samples=10):
     """Sample points along a 3D line segment for smooth visualization"""
     points = [start + t * (end - start) for t in np.linspace(0, 1, num_samples)]
@@ -0,0 +1,41 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+# All rights reserved.
+#
+# This source code is licensed under the license found in the
+# LICENSE file in the root directory of this source tree.
+
+"""Unit tests for plot_utils.py module."""
+
+import unittest
+
+import numpy as np
+
+from aria_gen2_pilot_dataset.visualization.plot_utils import subsample_depth_map
+
+
+class TestSubsampleDepthMap(unittest.TestCase):
+    """Test cases for subsample_depth_map function."""
+
+    def test_integer_factor(self) -> None:
+        """Test that every factor-th pixel is kept, starting from the first one."""
+        depth_map = np.arange(8 * 12, dtype=np.uint16).reshape(8, 12)
+        subsampled_depth_map = subsample_depth_map(depth_map, 4)
+        self.assertEqual(subsampled_depth_map.shape, (2, 3))
+        self.assertEqual(subsampled_depth_map.dtype, np.uint16)
+        self.assertTrue(subsampled_depth_map.flags.c_contiguous)
+        np.testing.assert_array_equal(subsampled_depth_map, [[0, 4, 8], [48, 52, 56]])
+
+    def test_dimensions_not_multiple_of_factor(self) -> None:
+        """Test that partial blocks at the bottom and right edges are cropped."""
+        depth_map = np.arange(10 * 7, dtype=np.uint16).reshape(10, 7)
+        for factor, expected_shape in [(2, (5, 3)), (3, (3, 2)), (4, (2, 1))]:
+            with self.subTest(factor=factor):
+                subsampled_depth_map = subsample_depth_map(depth_map, factor)
+                self.assertEqual(subsampled_depth_map.shape, expected_shape)
+                np.testing.assert_array_equal(
+                    subsampled_depth_map,
+                    depth_map[
+                        : expected_shape[0] * factor : factor,
+                        : expected_shape[1] * factor : factor,
+                    ],
+                )